@@ -14,15 +14,26 @@
 
 from __future__ import annotations
 
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional, Tuple, Callable
+from datetime import datetime
+import json
 import logging
+import math
 import re
 from statistics import median
 from functools import lru_cache
+from itertools import groupby
+from operator import itemgetter
 import os
 import threading
 
+try:
+    import numpy as np
+except Exception:  # pragma: no cover
+    np = None  # type: ignore
+
 # 선택적 OpenAI 클라이언트 (설치되지 않았을 수 있음)
 try:  # pragma: no cover
     from openai import OpenAI  # type: ignore
@@ -35,6 +46,12 @@ try:
 except Exception:  # pragma: no cover - allow import even before module is present in some envs
     get_code_lexicon = None  # type: ignore
 
+# 코드 해석 폴백(code_normalizer가 없거나 해석 실패 시 _resolve_code_uncached에서 사용)
+try:
+    from .reference.code_lexicon import resolve_code as _resolve_code_direct
+except Exception:  # pragma: no cover
+    _resolve_code_direct = None  # type: ignore
+
 # 프롬프트 모듈
 try:
     from src.prompts import (
@@ -69,6 +86,221 @@ DocumentResult = Dict[str, Any]
 Intermediates = Dict[str, Any]
 
 
+# -----------------------
+# 모듈 공용 정규식 (임포트 시 1회 컴파일)
+# -----------------------
+# 메타데이터 스캔(Step 7): 병원명(무라벨) 접미 패턴
+_KOR_HOSPITAL_RE = re.compile(r"""([가-힣A-Za-z0-9&'"()·\- ]{1,60}?(?:동물)?병원)\b""")
+_ENG_HOSPITAL_RE = re.compile(
+    r"""([A-Za-z0-9&' .\-]{2,80}?(?:Animal Hospital|Veterinary (?:Clinic|Hospital|Center|Centre)|Animal Medical Center|Pet Clinic|Vet Clinic|Animal Clinic))""",
+    re.IGNORECASE,
+)
+# 영어 병원 패턴의 모든 접미 대안이 포함하는 소문자 키워드(정규식 실행 전 저비용 사전 필터)
+_ENG_HOSPITAL_HINTS: Tuple[str, ...] = ("hospital", "clinic", "veterinary", "medical center")
+
+# 메타데이터 스캔(Step 7): 날짜 문자열 검증/정규화 패턴 (순서가 우선순위)
+_DATE_PARSE_PATTERNS: Tuple[Tuple[re.Pattern[str], str], ...] = (
+    (re.compile(r"(?P<year>19\d{2}|20\d{2})[.\-/\s년]\s*(?P<month>\d{1,2})[.\-/\s월]\s*(?P<day>\d{1,2})"), "ymd"),
+    (re.compile(r"(?P<day>\d{1,2})[.\-/]\s*(?P<month>\d{1,2})[.\-/]\s*(?P<year>19\d{2}|20\d{2})"), "dmy"),
+    (re.compile(r"(?P<year>\d{2})[.\-/]\s*(?P<month>\d{1,2})[.\-/]\s*(?P<day>\d{1,2})"), "ymd2"),
+    (re.compile(r"(?<!\d)(?P<year>19\d{2}|20\d{2})(?P<month>\d{2})(?P<day>\d{2})(?!\d)"), "ymd"),
+)
+
+# 행 정규화(Step 8~11, 최종 JSON): 숫자/참조범위/플래그 패턴
+_REF_SPLIT_RE = re.compile(r"^\s*([+-]?\d+(?:[.,]\d+)?)\s*[\-–~]\s*([+-]?\d+(?:[.,]\d+)?)\s*$")
+_LEADING_NUM_RE = re.compile(r"^[+-]?\d+(?:\.\d+)?")
+_LEADING_NUM_COMMA_RE = re.compile(r"^[+-]?\d+(?:[.,]\d+)?")
+_NUM_FLAG_SUFFIX_RE = re.compile(r"^[+-]?\d+(?:[.,]\d+)?\s*([HhLlNn])\s*$")
+# 디버그(Step 12): 토큰 텍스트 앞부분의 숫자(그룹 1) 추출
+_LEADING_NUM_GROUP_RE = re.compile(r"^\s*([+-]?\d+(?:[.,]\d+)?)")
+# 튜플 첫 원소(좌표 등) 정렬 키
+_first_item = itemgetter(0)
+# 밴드 배정에서 평면 (열, 텍스트) 누적 방식을 쓰기 시작하는 열 수 기준(이하는 열별 리스트가 더 빠름)
+# Settings.band_flat_cells_min_cols의 기본값
+_FLAT_CELLS_MIN_K = 8
+
+# 디버그 표(Step 8): 역할 후보 순서와 우측 정렬(숫자) 역할
+_DEBUG_ROLE_ORDER: Tuple[str, ...] = ("name", "unit", "reference", "min", "max", "result")
+_DEBUG_ALIGN_RIGHT_ROLES = frozenset(("result", "min", "max"))
+# 디버그 표(Step 9~13): 우측 정렬(숫자) 열 라벨. 각 표의 라벨 중 숫자 열만 여기에 해당한다.
+_DEBUG_RIGHT_ALIGN_LABELS = frozenset((
+    "Result", "result_norm", "Min", "min_norm", "Max", "max_norm",
+    "value", "value_conf", "reference_min", "reference_max",
+))
+# 디버그 표(Step 8): OCR 헤더 라벨이 없을 때 쓰는 역할별 기본 라벨
+_DEBUG_ROLE_DEFAULT_LABEL: Dict[str, str] = {
+    "name": "Name",
+    "unit": "Unit",
+    "reference": "Reference",
+    "min": "Min",
+    "max": "Max",
+    "result": "Result",
+}
+
+
+def _is_unsigned_number(s: str) -> bool:
+    r"""\d+([.,]\d+)? 형태인지(부호 없음) 문자열 메서드로 판정."""
+    head, dot, tail = s.replace(",", ".").partition(".")
+    return head.isdecimal() and (not dot or tail.isdecimal())
+
+
+def _norm_number_str(val: Any) -> Optional[str]:
+    """숫자(+선택 H/L/N 플래그) 문자열을 소수점 '.' 표기의 숫자 문자열로 정리. 실패/UNKNOWN이면 None."""
+    if not isinstance(val, str):
+        return None
+    t = val.strip()
+    if not t or t.upper() == "UNKNOWN":
+        return None
+    # 숫자+플래그(H/L/N) 꼬리 제거
+    if t[-1] in "HhLlNn":
+        t = t[:-1]
+    # 형태 확인: [+-]?\d+([.,]\d+)? (정규식 없이 문자열 메서드로 판정)
+    if not _is_unsigned_number(t[1:] if t[:1] in ("+", "-") else t):
+        return None
+    num = t.replace("·", ".").replace(",", ".")
+    # 유효성 확인
+    try:
+        float(num)
+    except Exception:
+        return None
+    return num
+
+
+def _split_ref_bounds(ref: str) -> Optional[Tuple[str, str]]:
+    """참조범위 'a-b' / 'a–b' / 'a ~ b'를 (a, b) 원문 문자열로 분리. 형태가 아니면 None.
+
+    구분자가 정확히 하나이고 양쪽이 부호 없는 숫자인 흔한 경우는 partition으로 처리하고,
+    부호가 붙은 값 등은 _REF_SPLIT_RE로 판정한다(결과는 정규식과 동일).
+    """
+    t = ref.strip()
+    if t.count("-") + t.count("–") + t.count("~") == 1:
+        sep = "-" if "-" in t else ("–" if "–" in t else "~")
+        a, _, b = t.partition(sep)
+        a = a.strip()
+        b = b.strip()
+        if _is_unsigned_number(a) and _is_unsigned_number(b):
+            return a, b
+    m = _REF_SPLIT_RE.match(ref)
+    if m:
+        return m.group(1), m.group(2)
+    return None
+
+
+def _ref_bound_to_float(s: str) -> Optional[float]:
+    """참조범위 경계 문자열(중점/쉼표 소수점 허용)을 float로 변환. 실패 시 None."""
+    try:
+        return float(s.replace("·", ".").replace(",", ".").strip())
+    except Exception:
+        return None
+
+
+def _first_token_line_index(line: Any) -> Any:
+    """라인(토큰 리스트)의 첫 토큰이 dict이면 그 'line_index'를, 아니면 None을 반환."""
+    if line and isinstance(line, (list, tuple)):
+        first = line[0]
+        if isinstance(first, dict):
+            return first.get("line_index")
+    return None
+
+
+def _step12_dedup_key(t: Dict[str, Any]) -> Optional[Tuple[str, Optional[str]]]:
+    """Step 12 중복 판정 키: (code, unit). 단위가 비어있으면 (code, None), code가 비어있으면 None."""
+    # strip 결과를 한 번만 만들어 판정/키 구성에 재사용
+    c = t.get("code")
+    if not isinstance(c, str):
+        return None
+    c = c.strip()
+    if not c:
+        return None
+    u = t.get("unit")
+    if isinstance(u, str):
+        u = u.strip()
+        return (c, u or None)
+    return (c, None)
+
+
+def _debug_str(v: Any) -> str:
+    """디버그 표 셀 문자열: None/변환 실패는 빈 문자열."""
+    # 대부분의 셀은 None/str/숫자이므로 try 없이 바로 처리
+    if v is None:
+        return ""
+    if type(v) is str:
+        return v
+    if isinstance(v, (int, float)):
+        return str(v)
+    try:
+        return str(v)
+    except Exception:
+        return ""
+
+
+def _debug_disp(v: Any) -> str:
+    """디버그 표 셀 문자열: None/공백/변환 실패는 'UNKNOWN'."""
+    if v is None:
+        return "UNKNOWN"
+    if type(v) is str:
+        return v if v.strip() else "UNKNOWN"
+    if isinstance(v, (int, float)):
+        return str(v)  # 숫자 문자열은 비지 않음
+    try:
+        s = str(v)
+        return s if s.strip() else "UNKNOWN"
+    except Exception:
+        return "UNKNOWN"
+
+
+def _debug_to_float(v: Any) -> Optional[float]:
+    """디버그용 숫자 변환: 숫자는 float로, 문자열은 쉼표 소수점을 허용해 float로. 실패/기타 타입은 None."""
+    # 흔한 정확 타입(str/float/int)을 type 동일성으로 먼저 분기
+    t = type(v)
+    if t is str:
+        try:
+            return float(v.replace(",", "."))
+        except Exception:
+            return None
+    if t is float:
+        return float(v)
+    if v is None:
+        return None
+    if isinstance(v, (int, float)):
+        try:
+            return float(v)
+        except Exception:
+            return None
+    if isinstance(v, str):
+        try:
+            return float(v.replace(",", "."))
+        except Exception:
+            return None
+    return None
+
+
+def _row_format(keys: List[str], widths: List[int], right_aligned: Any) -> Callable[..., str]:
+    """디버그 표 한 행 포맷터: 열 폭/정렬을 고정한 템플릿의 바운드 format.
+
+    keys[i]가 right_aligned에 있으면 우측, 아니면 좌측 정렬. fmt(*cells)로 호출한다.
+    행마다 셀별 ljust/rjust + join을 반복하는 대신 format 1회로 렌더링하기 위함.
+    """
+    return " | ".join(
+        ("{:>%d}" if k in right_aligned else "{:<%d}") % w for k, w in zip(keys, widths, strict=True)
+    ).format
+
+
+@lru_cache(maxsize=32)
+def _compile_date_patterns(patterns: Tuple[str, ...]) -> Tuple[re.Pattern[str], ...]:
+    """설정(header_regex['date'])의 날짜 정규식 문자열을 1회 컴파일한다.
+
+    잘못된 패턴(re.error)은 건너뛴다. 설정값 튜플을 키로 캐시하므로 라인마다 재컴파일하지 않는다.
+    """
+    compiled: List[re.Pattern[str]] = []
+    for p in patterns:
+        try:
+            compiled.append(re.compile(p))
+        except re.error:
+            continue
+    return tuple(compiled)
+
+
 @dataclass
 class Settings:
     """LabTableExtractor 설정값.
@@ -110,6 +342,9 @@ class Settings:
     #   * include  : 밴드 내부 포함 방식만 사용(폴백 없음)
     #   * nearest  : 항상 최근접 중심(샘플 열 x-중앙값)으로만 배정, 밴드 포함 여부는 무시
     band_assignment_mode: str = "nearest"
+    # - band_flat_cells_min_cols: 열 수가 이 값을 넘으면 셀을 (열, 텍스트) 평면 목록으로 누적(많은 열에서 유리)
+    #   None이면 항상 열별 리스트 방식 사용(롤백용)
+    band_flat_cells_min_cols: Optional[int] = _FLAT_CELLS_MIN_K
 
     # 헤더-바디 일치율 게이트 설정 (OCR 헤더 신뢰성 검사)
     header_alignment_overall_threshold: float = 0.65
@@ -264,6 +499,12 @@ class LabTableExtractor:
             else:
                 self.lexicon = {}
 
+        # 코드 해석 결과 캐시(원문 텍스트 → 코드). 사전 객체가 바뀌면 비우며, 외부 리졸버가 있으면 쓰지 않는다(_resolve_code 참고).
+        self._resolve_code_cache: Dict[str, Optional[str]] = {}
+        self._resolve_code_cache_lexicon: Any = self.lexicon
+        # 디버그 렌더링용 역할 매핑 캐시(header_roles 객체, 매핑). _debug_roles_map 참고.
+        self._debug_roles_map_memo: Optional[Tuple[Any, Dict[str, Dict[str, Any]]]] = None
+
     # -----------------------
     # Public Orchestration API
     # -----------------------
@@ -285,6 +526,10 @@ class LabTableExtractor:
         """
         doc = self._init_doc_result()
 
+        # 라인 텍스트 결합 결과 메모(이번 추출 패스 동안만 유지; 키: (id(line), sep))
+        # - 라인 객체는 패스 내내 lines가 참조하므로 id 재사용 문제가 없다.
+        join_memo: Dict[Tuple[int, str], str] = {}
+
         # 전체 문서 라인에 대한 첫 토큰 코드 해석 스캔(디버그용)
         # - debug_step5에서 "문서 전체"의 코드 인식 실패 라인을 보여주기 위해 사용
         code_resolve_scan_all: List[Tuple[int, str, Optional[str], str]] = []
@@ -292,7 +537,7 @@ class LabTableExtractor:
             for i, l in enumerate(lines):
                 ftxt = self._first_token_text(l)
                 rcode = self._resolve_code(ftxt) if ftxt else None
-                preview = self._line_join_texts(l)
+                preview = self._memo_join_texts(join_memo, l)
                 code_resolve_scan_all.append((i, ftxt, rcode, preview))
         except Exception:
             code_resolve_scan_all = []
@@ -312,7 +557,7 @@ class LabTableExtractor:
         body_lines: Lines = []
         dropped: List[Tuple[int, str, str]] = []
         if body_start is not None:
-            body_lines, dropped = self._filter_body_by_codes(lines, body_start)
+            body_lines, dropped = self._filter_body_by_codes(lines, body_start, join_memo=join_memo)
         else:
             # 바디 시작 미검출: 이후 단계는 수행하지 않음
             if return_intermediates:
@@ -461,7 +706,9 @@ class LabTableExtractor:
         meta_dbg: Dict[str, Any] = {}
         try:
             if body_start is not None:
-                meta, meta_dbg = self._extract_metadata_above_body(lines, header_idx, body_start, header_roles)
+                meta, meta_dbg = self._extract_metadata_above_body(
+                    lines, header_idx, body_start, header_roles, join_memo=join_memo
+                )
                 # 문서 결과에도 채워둠 (불확실 시 None 유지)
                 doc.update({
                     k: v for k, v in meta.items() if k in ("hospital_name", "client_name", "patient_name", "inspection_date")
@@ -482,7 +729,7 @@ class LabTableExtractor:
                         try:
                             client_name = meta.get("client_name")
                             llm_patient_name = self._extract_patient_name_with_llm(
-                                lines, body_start, client_name=client_name
+                                lines, body_start, client_name=client_name, join_memo=join_memo
                             )
                             if llm_patient_name and str(llm_patient_name).strip():
                                 meta["patient_name"] = llm_patient_name
@@ -498,10 +745,15 @@ class LabTableExtractor:
         # - 각 라인에서 밴드에 해당하는 값이 비어 있으면 'unknown'으로 채웁니다.
         interim_rows: List[Dict[str, Any]] = []
         filled_rows: List[Dict[str, Any]] = []
+        # 헤더 기준 열 수 K는 Step 8/9에서 공통으로 쓰므로 1회만 산정해 전달
+        try:
+            header_col_count = self._max_col_count(header_roles)
+        except Exception:
+            header_col_count = None
         try:
             if body_lines:
                 # Header-anchored, pure-geometry interim builder returns rows and debug info
-                build_result = self._build_interim_table(body_lines, header_roles)
+                build_result = self._build_interim_table(body_lines, header_roles, col_count=header_col_count)
                 if isinstance(build_result, tuple):
                     interim_rows, step8_dbg = build_result
                 else:
@@ -543,36 +795,47 @@ class LabTableExtractor:
             # 실패 시 비워둠(디버그 용이)
             interim_rows, filled_rows = [], []
 
-        # 9) 라인-열 길이 정규화 (뒤에서 잘라 맞춤)
-        # - 헤더 역할(col_index) 기준 열 개수보다 많은 셀이 있는 행은 꼬리쪽을 제거하여 맞춘다.
+        # 9~11) 인터미디엇이 필요 없으면 행 단위 1패스로 처리(단계별 중간 목록 생략)
         step9_rows: List[Dict[str, Any]] = []
-        try:
-            if filled_rows:
-                step9_rows = self._truncate_to_header_columns(filled_rows, header_roles)
-            else:
-                step9_rows = []
-        except Exception:
-            step9_rows = filled_rows or []
-
-        # 10) Reference → Min/Max 분리 (가능한 경우)
         step10_rows: List[Dict[str, Any]] = []
-        try:
-            if step9_rows:
-                step10_rows = self._split_reference_range(step9_rows)
-            else:
-                step10_rows = []
-        except Exception:
-            step10_rows = step9_rows or []
-
-        # 11) Unit/Result 정규화
         step11_rows: List[Dict[str, Any]] = []
-        try:
-            if step10_rows:
-                step11_rows = self._normalize_unit_and_result(step10_rows)
-            else:
+        fused_done = False
+        if not return_intermediates:
+            try:
+                step11_rows = self._finalize_rows(filled_rows, header_roles, col_count=header_col_count)
+                fused_done = True
+            except Exception:
+                # 실패 시 아래 단계별 경로로 재처리
                 step11_rows = []
-        except Exception:
-            step11_rows = step10_rows or []
+
+        if not fused_done:
+            # 9) 라인-열 길이 정규화 (뒤에서 잘라 맞춤)
+            # - 헤더 역할(col_index) 기준 열 개수보다 많은 셀이 있는 행은 꼬리쪽을 제거하여 맞춘다.
+            try:
+                if filled_rows:
+                    step9_rows = self._truncate_to_header_columns(filled_rows, header_roles, col_count=header_col_count)
+                else:
+                    step9_rows = []
+            except Exception:
+                step9_rows = filled_rows or []
+
+            # 10) Reference → Min/Max 분리 (가능한 경우)
+            try:
+                if step9_rows:
+                    step10_rows = self._split_reference_range(step9_rows)
+                else:
+                    step10_rows = []
+            except Exception:
+                step10_rows = step9_rows or []
+
+            # 11) Unit/Result 정규화
+            try:
+                if step10_rows:
+                    step11_rows = self._normalize_unit_and_result(step10_rows)
+                else:
+                    step11_rows = []
+            except Exception:
+                step11_rows = step10_rows or []
 
         # 12) Final JSON shaping and validation
         final_doc: DocumentResult = {}
@@ -772,6 +1035,20 @@ class LabTableExtractor:
             return sep.join([cls._token_text(t) for t in line])
         return cls._token_text(line)
 
+    @classmethod
+    def _memo_join_texts(
+        cls, memo: Optional[Dict[Tuple[int, str], str]], line: Line, sep: str = " | "
+    ) -> str:
+        """_line_join_texts의 메모 버전. memo는 한 추출 패스 동안만 보유해야 한다(키: id(line))."""
+        if memo is None:
+            return cls._line_join_texts(line, sep=sep)
+        key = (id(line), sep)
+        text = memo.get(key)
+        if text is None:
+            text = cls._line_join_texts(line, sep=sep)
+            memo[key] = text
+        return text
+
     @staticmethod
     def _replace_first_token_text_inplace(line: Line, new_text: str) -> None:
         try:
@@ -921,9 +1198,40 @@ class LabTableExtractor:
             pass
         return {}
 
+    @classmethod
+    def _role_col_indices(cls, header_roles: Any) -> Dict[str, int]:
+        """역할 → col_index(int) 맵. _roles_to_mapping이 col_index를 int로 보장하므로 추가 변환/가드가 필요 없다.
+
+        열 인덱스만 필요한 경로(K 산정, 역할별 셀 매핑)에서 info dict 조회 대신 사용한다.
+        """
+        return {role: info["col_index"] for role, info in cls._roles_to_mapping(header_roles).items()}
+
+    @classmethod
+    def _max_col_count(cls, header_roles: Any) -> Optional[int]:
+        """헤더 역할 기준 열 수(max(col_index)+1). 유효한 col_index가 없으면 None."""
+        max_ci = max(cls._role_col_indices(header_roles).values(), default=-1)
+        return max_ci + 1 if max_ci >= 0 else None
+
+    def _debug_roles_map(self, header_roles: Any) -> Dict[str, Dict[str, Any]]:
+        """debug_stepN용 _roles_to_mapping. 같은 header_roles 객체면 직전 결과를 재사용한다.
+
+        한 intermediates로 debug_step6/8/12/13을 연달아 렌더링할 때 매번 재변환하지 않기 위함.
+        키는 객체 동일성이며 캐시가 원본 참조를 쥐고 있어 id 재사용 문제가 없다.
+        반환 매핑은 공유되므로 호출 측에서 수정하지 않는다.
+        """
+        memo = self._debug_roles_map_memo
+        if memo is not None and memo[0] is header_roles:
+            return memo[1]
+        roles_map = self._roles_to_mapping(header_roles)
+        self._debug_roles_map_memo = (header_roles, roles_map)
+        return roles_map
+
     # -----------------------
     # 코드 해석기 (모듈 위임)
     # -----------------------
+    # 코드 해석 캐시 최대 항목 수(초과 시 비우고 다시 채움)
+    _RESOLVE_CODE_CACHE_MAX = 4096
+
     def _resolve_code(self, text: str) -> Optional[str]:
         """검사코드 텍스트를 사전 기준으로 해석해 표준 코드 문자열을 반환.
 
@@ -931,7 +1239,32 @@ class LabTableExtractor:
         모듈이 없을 경우 code_lexicon.resolve_code를 직접 사용한다.
 
         또한 "SODIUM(Na+)" 같은 형태에서 괄호 앞부분만 추출하여 매칭을 시도한다.
+
+        외부 리졸버가 없으면 해석은 입력 문자열과 사전에만 의존하므로 인스턴스 단위로
+        결과를 캐시한다(첫 토큰 스캔, 코드 필터, 최종 JSON에서 같은 코드가 반복 해석됨).
+        사용자 리졸버(resolver)가 주어지면 결과가 호출 시점마다 다를 수 있으므로 캐시하지 않는다.
         """
+        if not text:
+            return None
+        if not isinstance(text, str) or self._ext_resolver is not None:
+            return self._resolve_code_uncached(text)
+        cache = self._resolve_code_cache
+        if self._resolve_code_cache_lexicon is not self.lexicon:
+            # 사전이 교체되었으면 이전 결과는 무효
+            cache.clear()
+            self._resolve_code_cache_lexicon = self.lexicon
+        try:
+            return cache[text]
+        except KeyError:
+            pass
+        result = self._resolve_code_uncached(text)
+        if len(cache) >= self._RESOLVE_CODE_CACHE_MAX:
+            cache.clear()
+        cache[text] = result
+        return result
+
+    def _resolve_code_uncached(self, text: str) -> Optional[str]:
+        """_resolve_code의 실제 해석 로직(캐시 미사용)."""
         if not text:
             return None
 
@@ -947,9 +1280,7 @@ class LabTableExtractor:
                 pass
 
         # 2) 폴백: code_lexicon.resolve_code 직접 사용
-        try:
-            from .reference.code_lexicon import resolve_code as _resolve_code_direct
-        except ImportError:
+        if _resolve_code_direct is None:
             return None
 
         # 2-1) 전체 텍스트로 먼저 시도
@@ -1012,7 +1343,7 @@ class LabTableExtractor:
         return None
 
     def _filter_body_by_codes(
-        self, lines: Lines, start_idx: int
+        self, lines: Lines, start_idx: int, *, join_memo: Optional[Dict[Tuple[int, str], str]] = None
     ) -> Tuple[Lines, List[Tuple[int, str, str]]]:
         """start_idx 이후 라인에서 첫 토큰이 검사코드로 해석되는 라인만 남긴다.
 
@@ -1041,7 +1372,7 @@ class LabTableExtractor:
                 else:
                     body.append(line)
             else:
-                dropped.append((idx, first, self._line_join_texts(line)))
+                dropped.append((idx, first, self._memo_join_texts(join_memo, line)))
 
         return body, dropped
 
@@ -1688,9 +2019,8 @@ class LabTableExtractor:
                 # SDK 또는 호출 오류 시 조용히 중단
                 return {}, sample
 
-            import json as _json
             try:
-                parsed = _json.loads(content or "{}")
+                parsed = json.loads(content or "{}")
             except Exception:
                 return {}, sample
 
@@ -1789,7 +2119,13 @@ class LabTableExtractor:
             return {}, []
 
     def _extract_metadata_above_body(
-        self, lines: Lines, header_index: Optional[int], body_start_idx: int, header_roles: Any | None = None
+        self,
+        lines: Lines,
+        header_index: Optional[int],
+        body_start_idx: int,
+        header_roles: Any | None = None,
+        *,
+        join_memo: Optional[Dict[Tuple[int, str], str]] = None,
     ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
         """바디 시작 위(헤더 포함) 영역에서 병원/의뢰인/환자/검사일 메타데이터를 규칙 기반으로 추출.
 
@@ -1861,12 +2197,19 @@ class LabTableExtractor:
                 r"\b\d{2}[-./]\d{1,2}[-./]\d{1,2}\b",
             ]
 
+        # 이름 결합 관련 설정값은 호출 중 불변 → 지역 상수로 1회 평가(라벨/토큰 루프에서 속성 조회 제거)
+        stop_on_date_like = bool(self.settings.name_stop_on_date_like)
+        name_min_gap_px = int(self.settings.name_concat_min_gap_px)
+        name_gap_multiplier = self.settings.name_concat_max_gap_multiplier
+        name_max_tokens = max(1, int(self.settings.name_concat_max_tokens))
+        long_numeric_re = re.compile(rf"\d{{{int(self.settings.name_block_long_numeric_len)},}}")
+
         def norm(s: str) -> str:
             return re.sub(r"\s+", " ", s).strip()
 
         def joined(line: Line) -> str:
             try:
-                return self._line_join_texts(line, sep=" ")
+                return self._memo_join_texts(join_memo, line, sep=" ")
             except Exception:
                 return str(line)
 
@@ -1934,6 +2277,20 @@ class LabTableExtractor:
                 mid = len(gaps) // 2
                 return gaps[mid]
 
+        # 라인별 기하 캐시(이번 호출 동안만 유지; 키: id(line))
+        # - 같은 라인에 여러 라벨을 시도해도 토큰 정렬/중앙 간격 계산은 1회만 수행
+        geom_cache: Dict[int, Tuple[List[Tuple[int, int, str]], int]] = {}
+
+        def _line_geometry(line: Line) -> Tuple[List[Tuple[int, int, str]], int]:
+            """(정렬된 토큰 좌표 목록, 중앙 간격)을 라인별로 캐시해 반환."""
+            key = id(line)
+            cached = geom_cache.get(key)
+            if cached is None:
+                toks = _tokenize_with_geometry(line)
+                cached = (toks, _median_gap(toks) if toks else 0)
+                geom_cache[key] = cached
+            return cached
+
         def _parse_valid_date(s: Any) -> Optional[str]:
             """문자열이 실제 유효한 날짜인지 검사하고 YYYY-MM-DD로 정규화.
 
@@ -1951,17 +2308,8 @@ class LabTableExtractor:
                 return None
             # 한국어 오전/오후 제거
             t = t.replace("오전", "").replace("오후", "")
-            import re as _re
-            from datetime import datetime as _dt
-
-            patterns = [
-                (_re.compile(r"(?P<year>19\d{2}|20\d{2})[.\-/\s년]\s*(?P<month>\d{1,2})[.\-/\s월]\s*(?P<day>\d{1,2})"), "ymd"),
-                (_re.compile(r"(?P<day>\d{1,2})[.\-/]\s*(?P<month>\d{1,2})[.\-/]\s*(?P<year>19\d{2}|20\d{2})"), "dmy"),
-                (_re.compile(r"(?P<year>\d{2})[.\-/]\s*(?P<month>\d{1,2})[.\-/]\s*(?P<day>\d{1,2})"), "ymd2"),
-                (_re.compile(r"(?<!\d)(?P<year>19\d{2}|20\d{2})(?P<month>\d{2})(?P<day>\d{2})(?!\d)"), "ymd"),
-            ]
 
-            for rx, kind in patterns:
+            for rx, kind in _DATE_PARSE_PATTERNS:
                 m = rx.search(t)
                 if not m:
                     continue
@@ -1971,7 +2319,7 @@ class LabTableExtractor:
                         y = 1900 + y if y >= 70 else 2000 + y
                     mo = int(m.group("month"))
                     d = int(m.group("day"))
-                    _dt(y, mo, d)
+                    datetime(y, mo, d)
                     return f"{y:04d}-{mo:02d}-{d:02d}"
                 except Exception:
                     continue
@@ -1993,7 +2341,7 @@ class LabTableExtractor:
                 # 길고 숫자 위주 토큰은 잘라내기 시작 신호
                 if re.fullmatch(r"\d{6,}", tok):
                     break
-                if self.settings.name_stop_on_date_like and _is_date_like(tok):
+                if stop_on_date_like and _is_date_like(tok):
                     break
                 pruned.append(tok)
             return norm(" ".join(pruned))
@@ -2008,7 +2356,7 @@ class LabTableExtractor:
             - 순수 숫자 길이>=name_block_long_numeric_len 또는 날짜 유사 토큰을 만나면 중단
             - 최대 name_concat_max_tokens 개까지만 결합
             """
-            toks = _tokenize_with_geometry(line)
+            toks, med_gap = _line_geometry(line)
             if not toks:
                 return None
 
@@ -2022,15 +2370,14 @@ class LabTableExtractor:
             if anchor_idx < 0:
                 return None
 
-            med_gap = _median_gap(toks)
-            gap_thresh = max(int(self.settings.name_concat_min_gap_px), int(round(self.settings.name_concat_max_gap_multiplier * float(med_gap or 0))))
+            gap_thresh = max(name_min_gap_px, int(round(name_gap_multiplier * float(med_gap or 0))))
             # med_gap이 0일 수 있으므로 최소 임계 보장
-            gap_thresh = max(gap_thresh, int(self.settings.name_concat_min_gap_px))
+            gap_thresh = max(gap_thresh, name_min_gap_px)
 
             # anchor의 오른쪽부터 진행
             collected: List[str] = []
             prev_right = toks[anchor_idx][1]
-            max_tokens = max(1, int(self.settings.name_concat_max_tokens))
+            max_tokens = name_max_tokens
             for j in range(anchor_idx + 1, len(toks)):
                 xl, xr, s = toks[j]
                 if not s:
@@ -2043,9 +2390,9 @@ class LabTableExtractor:
                 if gap > gap_thresh:
                     break
                 # 숫자/날짜 유사 토큰 확인
-                if re.fullmatch(rf"\d{{{int(self.settings.name_block_long_numeric_len)},}}", s):
+                if long_numeric_re.fullmatch(s):
                     break
-                if self.settings.name_stop_on_date_like and _is_date_like(s):
+                if stop_on_date_like and _is_date_like(s):
                     break
                 collected.append(s)
                 prev_right = xr
@@ -2091,14 +2438,36 @@ class LabTableExtractor:
             "patient_name": [],
             "inspection_date": [],
         }
+        # 필드별 최고 후보는 수집 시점에 갱신(선택 시 후보 목록 전체 재스캔 불필요)
+        # - candidates 목록은 디버그(Step 7 미리보기)용으로 그대로 보존
+        best_candidates: Dict[str, Tuple[float, Dict[str, Any]]] = {}
 
-        # 병원명(무라벨) 탐지를 위한 정규식 준비
-        kor_hosp_re = re.compile(r"""([가-힣A-Za-z0-9&'"()·\- ]{1,60}?(?:동물)?병원)\b""")
-        eng_hosp_re = re.compile(
-            r"""([A-Za-z0-9&' .\-]{2,80}?(?:Animal Hospital|Veterinary (?:Clinic|Hospital|Center|Centre)|Animal Medical Center|Pet Clinic|Vet Clinic|Animal Clinic))""",
-            re.IGNORECASE,
-        )
-        import math
+        def _candidate_key(it: Dict[str, Any]) -> float:
+            # 최근(헤더 근처)일수록 약간 가중치: index가 클수록 +0.1*log1p
+            base = float(it.get("score", 0.0))
+            idx_weight = 0.0
+            try:
+                idx_weight = 0.1 * math.log1p(float(it.get("line_index", 0)))
+            except Exception:
+                idx_weight = 0.0
+            return base + idx_weight
+
+        def _add_candidate(field: str, item: Dict[str, Any]) -> None:
+            candidates[field].append(item)
+            k = _candidate_key(item)
+            cur = best_candidates.get(field)
+            # 동점이면 먼저 수집된 후보 유지(max()와 동일한 선택 규칙)
+            if cur is None or k > cur[0]:
+                best_candidates[field] = (k, item)
+
+        # 병원명(무라벨) 탐지 정규식은 모듈 로드 시 1회 컴파일된 것을 사용
+        kor_hosp_re = _KOR_HOSPITAL_RE
+        eng_hosp_re = _ENG_HOSPITAL_RE
+        # 날짜 정규식도 라인마다 재컴파일하지 않도록 1회 컴파일(잘못된 패턴은 제외)
+        try:
+            date_res = _compile_date_patterns(tuple(date_patterns))
+        except Exception:
+            date_res = ()
         negative_addr_tokens = [
             "tel", "fax", "전화", "mobile", "http", "www", "@", "e-mail", "email", "주소", "address", "도로명",
         ]
@@ -2155,7 +2524,7 @@ class LabTableExtractor:
                             # 추출된 값이 'Unit Min Max Result' 등인 경우 제외
                             val = None
                     if val and _looks_name(val):
-                        candidates["patient_name"].append({
+                        _add_candidate("patient_name", {
                             "label": lab,
                             "value": val,
                             "score": 1.0,
@@ -2169,7 +2538,8 @@ class LabTableExtractor:
                 pass
             else:
                 # 한국어: '...병원' 또는 '...동물병원'으로 끝나는 구
-                for m in kor_hosp_re.finditer(text):
+                # - '병원' 부분 문자열이 없으면 정규식 실행 생략
+                for m in (kor_hosp_re.finditer(text) if "병원" in text else ()):
                     cand = norm(m.group(1))
                     if not cand or cand in ("병원", "동물병원"):
                         continue
@@ -2181,7 +2551,7 @@ class LabTableExtractor:
                     len_bonus = min(len(cand) / 18.0, 1.0)
                     idx_bonus = -0.2 * math.log1p(float(i))
                     score = 1.0 + suffix_bonus + len_bonus + idx_bonus
-                    candidates["hospital_name"].append({
+                    _add_candidate("hospital_name", {
                         "label": "suffix-kor",
                         "value": cand,
                         "score": round(score, 3),
@@ -2189,7 +2559,9 @@ class LabTableExtractor:
                     })
 
                 # 영어: '... Animal Hospital', '... Veterinary Clinic' 등
-                for m in eng_hosp_re.finditer(text):
+                # - 접미 키워드가 하나도 없으면 정규식 실행 생략
+                eng_hint = any(h in low for h in _ENG_HOSPITAL_HINTS)
+                for m in (eng_hosp_re.finditer(text) if eng_hint else ()):
                     cand = norm(m.group(1))
                     if not cand:
                         continue
@@ -2215,7 +2587,7 @@ class LabTableExtractor:
                     idx_bonus = -0.2 * math.log1p(float(i))
                     len_bonus = min(len(cand) / 20.0, 1.0)
                     score = 1.0 + suf + len_bonus + idx_bonus
-                    candidates["hospital_name"].append({
+                    _add_candidate("hospital_name", {
                         "label": "suffix-eng",
                         "value": cand,
                         "score": round(score, 3),
@@ -2237,7 +2609,7 @@ class LabTableExtractor:
                     elif val and _is_header_like(text):
                         val = None
                     if val and _looks_name(val):
-                        candidates["client_name"].append({
+                        _add_candidate("client_name", {
                             "label": lab,
                             "value": val,
                             "score": 0.9,
@@ -2249,11 +2621,8 @@ class LabTableExtractor:
             # 라벨 맥락 점수 + 패턴 매칭
             ds = _date_score_context(low)
             if ds > -0.5:  # 강한 음성 맥락이 아니면 검색
-                for pat in date_patterns:
-                    try:
-                        m = re.search(pat, text)
-                    except re.error:
-                        continue
+                for date_re in date_res:
+                    m = date_re.search(text)
                     if m:
                         raw_val = norm(m.group(0))
                         norm_date = _parse_valid_date(raw_val)
@@ -2263,7 +2632,7 @@ class LabTableExtractor:
                         # 너무 짧은 2자리 년도는 가점 낮게(정규화는 YYYY)
                         y4 = True  # norm_date는 YYYY-MM-DD
                         score = ds + (1.5 if y4 else 0.7)
-                        candidates["inspection_date"].append({
+                        _add_candidate("inspection_date", {
                             "label": "date-pattern",
                             "value": norm_date,
                             "value_raw": raw_val,
@@ -2274,22 +2643,10 @@ class LabTableExtractor:
 
         # 선택: 각 필드 상위 점수 후보
         def pick_best(field: str) -> Optional[str]:
-            items = candidates.get(field) or []
-            if not items:
+            entry = best_candidates.get(field)
+            if entry is None:
                 return None
-            # 최근(헤더 근처)일수록 약간 가중치: index가 클수록 +0.1*log1p
-            import math
-
-            def key_fn(it: Dict[str, Any]) -> float:
-                base = float(it.get("score", 0.0))
-                idx_weight = 0.0
-                try:
-                    idx_weight = 0.1 * math.log1p(float(it.get("line_index", 0)))
-                except Exception:
-                    idx_weight = 0.0
-                return base + idx_weight
-
-            best = max(items, key=key_fn)
+            best = entry[1]
             return norm(str(best.get("value", ""))) or None
 
         # 최종 선택(inspection_date는 이미 정규화된 후보만 존재)
@@ -2341,7 +2698,12 @@ class LabTableExtractor:
         return meta, debug
 
     def _extract_patient_name_with_llm(
-        self, lines: Lines, body_start_idx: int, client_name: Optional[str] = None
+        self,
+        lines: Lines,
+        body_start_idx: int,
+        client_name: Optional[str] = None,
+        *,
+        join_memo: Optional[Dict[Tuple[int, str], str]] = None,
     ) -> Optional[str]:
         """규칙 기반으로 patient_name을 찾지 못했을 때 LLM으로 폴백 추출.
 
@@ -2389,7 +2751,7 @@ class LabTableExtractor:
             header_texts: List[str] = []
             for line in region:
                 try:
-                    text = self._line_join_texts(line, sep=" ")
+                    text = self._memo_join_texts(join_memo, line, sep=" ")
                     if text and text.strip():
                         header_texts.append(text.strip())
                 except Exception:
@@ -2632,7 +2994,7 @@ class LabTableExtractor:
             return 0.0, {}
 
     def _build_interim_table(
-        self, body_lines: Lines, header_roles: Any
+        self, body_lines: Lines, header_roles: Any, *, col_count: Optional[int] = None
     ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
         """Step 8(geometry-only): 헤더를 진실로 보고, 순수 기하 샘플(K개 토큰 라인)만으로 밴드를 형성.
 
@@ -2647,27 +3009,31 @@ class LabTableExtractor:
           · interim_rows: {'_cells': List[str], '_bands': List[(L,R)], '_line_idx': int}
           · dbg: {'K': int, 'sample_count': int, 'sample_body_indices': List[int], 'band_centers': List[int]}
         """
-        from statistics import median
-        # 0) K 산정(헤더 기반)
-        K = None
-        try:
-            max_ci = -1
-            roles_map = self._roles_to_mapping(header_roles)
-            for info in roles_map.values():
-                if isinstance(info, dict) and "col_index" in info:
-                    ci = int(info.get("col_index", -1))
-                    if ci > max_ci:
-                        max_ci = ci
-            if max_ci >= 0:
-                K = max_ci + 1
-        except Exception:
-            K = None
+        # 0) K 산정(헤더 기반; 호출 측이 미리 산정한 col_count가 있으면 재사용)
+        K = col_count
+        if K is None:
+            try:
+                K = self._max_col_count(header_roles)
+            except Exception:
+                K = None
         if not isinstance(K, int) or K <= 0:
             # 헤더가 없거나 비정상 — 본 전략 전제 밖. 빈 결과와 dbg 반환
             return [], {"K": None, "sample_count": 0, "sample_body_indices": [], "band_centers": []}
 
         # 1) 토큰 추출(기하 중심)
+        # - 샘플 채취(2)와 전체 배정(6)에서 같은 라인을 다시 정리하지 않도록 id(line) 키로 캐시
+        # - 캐시는 이번 호출 동안만 유지하며, 반환 목록은 읽기 전용으로만 사용
+        tok_cache: Dict[int, List[Tuple[int, int, str, Any]]] = {}
+
         def _tokens_with_centers(line: Line) -> List[Tuple[int, int, str, Any]]:
+            key = id(line)
+            cached = tok_cache.get(key)
+            if cached is None:
+                cached = _compute_tokens_with_centers(line)
+                tok_cache[key] = cached
+            return cached
+
+        def _compute_tokens_with_centers(line: Line) -> List[Tuple[int, int, str, Any]]:
             out: List[Tuple[int, int, str, Any]] = []
             if isinstance(line, (list, tuple)):
                 for t in line:
@@ -2677,22 +3043,26 @@ class LabTableExtractor:
                         xl = t.get("x_left"); xr = t.get("x_right")
                         if xl is None or xr is None:
                             continue
-                        xl_i = int(round(float(xl))); xr_i = int(round(float(xr)))
-                        if xr_i < xl_i:
-                            xl_i, xr_i = xr_i, xl_i
-                        c = int((xl_i + xr_i) // 2)
-                        w = max(1, xr_i - xl_i)
+                        # 빈 텍스트 토큰은 좌표 변환 전에 제외
                         s = str(t.get("text", "") or "").strip()
                         if not s:
                             continue
-                        out.append((c, w, s, t))
+                        # 정수 픽셀 좌표(일반적인 OCR 출력)는 float/round 변환 생략
+                        xl_i = xl if type(xl) is int else int(round(float(xl)))
+                        xr_i = xr if type(xr) is int else int(round(float(xr)))
+                        if xr_i < xl_i:
+                            xl_i, xr_i = xr_i, xl_i
+                        out.append(((xl_i + xr_i) // 2, max(1, xr_i - xl_i), s, t))
                     except Exception:
                         continue
-            return sorted(out, key=lambda x: x[0])
+            # 중심 x 기준 정렬(안정 정렬, 제자리)
+            out.sort(key=_first_item)
+            return out
 
         # 2) 샘플 채취: 유효 토큰 수 == K
         sample_body_indices: List[int] = []
-        sample_centers_by_idx: List[List[int]] = [[] for _ in range(K)]
+        # 샘플 라인별 K개 중심(행=샘플, 열=컬럼 인덱스)
+        sample_centers: List[List[int]] = []
         # 앞쪽 N개만 보되, 충분하지 않으면 더 볼 필요 없이 조건만 충족하는 라인만 채택
         sample_limit = int(getattr(self.settings, "header_alignment_preview_rows", 20)) or 20
         for i, line in enumerate(body_lines[: max(1, sample_limit)]):
@@ -2700,8 +3070,7 @@ class LabTableExtractor:
             if len(toks) == K:
                 sample_body_indices.append(i)
                 # 좌→우 정렬 가정: 이미 정렬됨, 인덱스별 중심 수집
-                for j in range(K):
-                    sample_centers_by_idx[j].append(int(toks[j][0]))
+                sample_centers.append([int(toks[j][0]) for j in range(K)])
 
         sample_count = len(sample_body_indices)
         if sample_count == 0:
@@ -2709,9 +3078,13 @@ class LabTableExtractor:
 
         # 3) 밴드 중심 계산
         if sample_count == 1:
-            band_centers = [sample_centers_by_idx[j][0] for j in range(K)]
+            band_centers = list(sample_centers[0])
+        elif np is not None:
+            # 컬럼별 중앙값을 한 번에 계산(짝수 개면 가운데 두 값 평균 후 0 방향 절삭: int(median)과 동일)
+            arr = np.asarray(sample_centers, dtype=np.int64)
+            band_centers = np.median(arr, axis=0).astype(np.int64).tolist()
         else:
-            band_centers = [int(median(sample_centers_by_idx[j])) if sample_centers_by_idx[j] else 0 for j in range(K)]
+            band_centers = [int(median(col)) for col in zip(*sample_centers, strict=True)]
 
         # 4) 경계 계산(인접 중심 중간값, 양끝 외삽)
         edges: List[int] = []
@@ -2729,49 +3102,140 @@ class LabTableExtractor:
         bands: List[Tuple[int, int]] = [(edges[i], edges[i + 1]) for i in range(len(edges) - 1)]
 
         # 5) 밴드 할당 함수(가장 가까운 중심)
-        def _assign_to_bands(toks: List[Tuple[int, int, str, Any]], bands: List[Tuple[int, int]]) -> List[str]:
-            K2 = len(bands)
-            cells: List[List[str]] = [[] for _ in range(K2)]
-            # 최근접 중심 판단 기준:
-            # - 우선 샘플로부터 계산한 band_centers(열의 x-중심값)를 사용
-            # - band_centers가 없거나 비정상인 경우에만 밴드 경계의 중간점으로 대체
-            centers_local = [int((L + R) // 2) for (L, R) in bands]
-            try:
-                _centers_ref = list(band_centers) if isinstance(band_centers, list) and len(band_centers) == K2 else centers_local
-            except Exception:
-                _centers_ref = centers_local
-            mode = str(getattr(self.settings, "band_assignment_mode", "hybrid") or "hybrid").lower()
-            for (c, _w, s, _tok) in toks:
-                if mode == "nearest":
-                    # 항상 최근접 중심 배정
-                    if K2 > 0:
-                        nearest = min(range(K2), key=lambda ii: abs(c - _centers_ref[ii]))
-                        cells[nearest].append(s)
+        # 최근접 중심 판단 기준:
+        # - 우선 샘플로부터 계산한 band_centers(열의 x-중심값)를 사용
+        # - band_centers가 없거나 비정상인 경우에만 밴드 경계의 중간점으로 대체
+        # 밴드/중심/모드는 라인마다 동일하므로 1회만 준비
+        K2 = len(bands)
+        centers_local = [int((L + R) // 2) for (L, R) in bands]
+        try:
+            _centers_ref = list(band_centers) if isinstance(band_centers, list) and len(band_centers) == K2 else centers_local
+        except Exception:
+            _centers_ref = centers_local
+        mode = str(getattr(self.settings, "band_assignment_mode", "hybrid") or "hybrid").lower()
+
+        # 이분 탐색 색인(밴드가 좌→우로 연속이고 중심이 비내림차순일 때만 사용; 아니면 선형 탐색)
+        # - 포함 판정: 좌측 경계 목록에서 c 이하인 마지막 밴드가 유일한 후보
+        # - 최근접 중심: 서로 다른 중심 사이 중간점(내림)으로 구간을 나누고, 동일 중심은 앞 인덱스 우선(min과 동일)
+        band_lefts = [L for (L, _R) in bands]
+        bands_contiguous = all(bands[ii][1] == bands[ii + 1][0] for ii in range(K2 - 1)) and all(L <= R for (L, R) in bands)
+        nearest_first_idx: List[int] = []
+        nearest_mids: List[int] = []
+        centers_sorted = all(_centers_ref[ii] <= _centers_ref[ii + 1] for ii in range(K2 - 1))
+        if centers_sorted:
+            for ii, cv in enumerate(_centers_ref):
+                if nearest_first_idx and _centers_ref[nearest_first_idx[-1]] == cv:
                     continue
+                if nearest_first_idx:
+                    nearest_mids.append((_centers_ref[nearest_first_idx[-1]] + cv) // 2)
+                nearest_first_idx.append(ii)
+
+        def _nearest_band(c: int) -> int:
+            if centers_sorted:
+                return nearest_first_idx[bisect_left(nearest_mids, c)]
+            return min(range(K2), key=lambda ii: abs(c - _centers_ref[ii]))
+
+        def _containing_band(c: int) -> int:
+            if bands_contiguous:
+                idx = bisect_right(band_lefts, c) - 1
+                if idx >= 0 and c < bands[idx][1]:
+                    return idx
+                return -1
+            for idx, (L, R) in enumerate(bands):
+                if L <= c < R:
+                    return idx
+            return -1
+
+        def _join_cells(cells: List[List[str]]) -> List[str]:
+            # 토큰 텍스트는 이미 strip된 비어있지 않은 문자열 → 단일 토큰 칸은 join 없이 그대로 사용
+            return [col[0] if len(col) == 1 else (" ".join(col).strip() if col else "") for col in cells]
+
+        def _make_assigner() -> Callable[[List[Tuple[int, int, str, Any]]], List[str]]:
+            """열 수(K)와 배정 모드에 특화된 밴드 배정 함수를 만든다(토큰 루프의 분기 축소)."""
+            is_nearest = mode == "nearest"
+            is_hybrid = mode == "hybrid"
+
+            if K2 == 1 and (is_nearest or is_hybrid):
+                # 단일 열: 포함이든 최근접 폴백이든 모든 토큰이 0번 밴드로 간다
+                def _assign_single(toks: List[Tuple[int, int, str, Any]]) -> List[str]:
+                    if len(toks) == 1:
+                        return [toks[0][2]]
+                    return [" ".join([t[2] for t in toks]).strip()]
+                return _assign_single
+
+            if K2 == 2 and bands_contiguous and centers_sorted:
+                # 두 열: 경계/중간점을 지역 상수로 고정
+                left_l, split_x, right_r = bands[0][0], bands[0][1], bands[1][1]
+                near_mid = nearest_mids[0] if nearest_mids else None
+
+                def _assign_pair(toks: List[Tuple[int, int, str, Any]]) -> List[str]:
+                    left: List[str] = []
+                    right: List[str] = []
+                    for (c, _w, s, _tok) in toks:
+                        if not is_nearest:
+                            if left_l <= c < split_x:
+                                left.append(s)
+                                continue
+                            if split_x <= c < right_r:
+                                right.append(s)
+                                continue
+                            if not is_hybrid:
+                                continue
+                        # 최근접 중심(동일 중심이면 앞 열)
+                        if near_mid is None or c <= near_mid:
+                            left.append(s)
+                        else:
+                            right.append(s)
+                    return _join_cells([left, right])
+                return _assign_pair
 
+            def _band_index(c: int) -> int:
+                """토큰 중심 c의 배정 밴드 인덱스(미배정이면 -1)."""
+                if is_nearest:
+                    # 항상 최근접 중심 배정
+                    return _nearest_band(c) if K2 > 0 else -1
                 # include-only 또는 hybrid 공통: 내부 포함 우선
-                placed = False
-                for idx, (L, R) in enumerate(bands):
-                    if L <= c < R:
+                idx = _containing_band(c)
+                if idx >= 0:
+                    return idx
+                # 외부는 hybrid에서만 최근접 중심, include-only는 미배정
+                return _nearest_band(c) if (is_hybrid and K2 > 0) else -1
+
+            flat_min_k = getattr(self.settings, "band_flat_cells_min_cols", _FLAT_CELLS_MIN_K)
+            if flat_min_k is not None and K2 > flat_min_k:
+                # 열이 많으면 라인마다 K개의 빈 리스트를 만드는 대신 (열, 텍스트) 평면 목록을
+                # 열 기준 안정 정렬 후 묶는다(같은 열 안의 토큰 순서 유지)
+                def _assign_flat(toks: List[Tuple[int, int, str, Any]]) -> List[str]:
+                    entries: List[Tuple[int, str]] = []
+                    for (c, _w, s, _tok) in toks:
+                        idx = _band_index(c)
+                        if idx >= 0:
+                            entries.append((idx, s))
+                    entries.sort(key=_first_item)
+                    out_cells = [""] * K2
+                    for idx, grp in groupby(entries, key=_first_item):
+                        texts = [s for _i, s in grp]
+                        out_cells[idx] = texts[0] if len(texts) == 1 else " ".join(texts).strip()
+                    return out_cells
+                return _assign_flat
+
+            def _assign_generic(toks: List[Tuple[int, int, str, Any]]) -> List[str]:
+                cells: List[List[str]] = [[] for _ in range(K2)]
+                for (c, _w, s, _tok) in toks:
+                    idx = _band_index(c)
+                    if idx >= 0:
                         cells[idx].append(s)
-                        placed = True
-                        break
-                if placed:
-                    continue
+                    # 미배정(include-only 모드의 밴드 외부)은 빈 칸 → 이후 UNKNOWN 처리
+                return _join_cells(cells)
+            return _assign_generic
 
-                if mode == "hybrid":
-                    # 외부는 최근접 중심(하위 옵션 제거: hybrid에서는 항상 적용)
-                    if K2 > 0:
-                        nearest = min(range(K2), key=lambda ii: abs(c - _centers_ref[ii]))
-                        cells[nearest].append(s)
-                # include-only 모드는 폴백 없이 미배정(빈 칸 → 이후 UNKNOWN 처리)
-            return [" ".join(col).strip() for col in cells]
+        assigner = _make_assigner()
 
         # 6) 전체 라인 배정
         rows: List[Dict[str, Any]] = []
         for i, line in enumerate(body_lines):
             toks = _tokens_with_centers(line)
-            cells = _assign_to_bands(toks, bands)
+            cells = assigner(toks)
             rows.append({"_cells": cells, "_bands": bands, "_line_idx": i})
 
         dbg = {
@@ -2801,22 +3265,71 @@ class LabTableExtractor:
         filled: List[Dict[str, Any]] = []
 
         # 역할→열 인덱스 맵(표시용)
+        role_cols = self._role_col_indices(header_roles)
+        header_present = bool(role_cols)
         role_to_idx: Dict[str, int] = {}
-        roles_map = self._roles_to_mapping(header_roles)
-        header_present = bool(roles_map)
         if header_present:
             for role in ["name", "reference", "min", "max", "result", "unit"]:
-                try:
-                    info = roles_map.get(role)
-                    if isinstance(info, dict) and "col_index" in info:
-                        ci = int(info.get("col_index", -1))
-                        if ci >= 0:
-                            role_to_idx[role] = ci
-                except Exception:
-                    continue
+                ci = role_cols.get(role, -1)
+                if ci >= 0:
+                    role_to_idx[role] = ci
         # 헤더가 없을 때만 기본 매핑 사용
         default_order = ["name", "reference", "result", "unit"]
 
+        # 행마다 동일한 (역할, 열 인덱스, min/max 여부) 목록을 1회 구성
+        # - 헤더가 있으면 헤더 col_index, 없으면 기본 순서(첫 4개 밴드)
+        if header_present:
+            role_slots = [(role, idx, role in ("min", "max")) for role, idx in role_to_idx.items()]
+        else:
+            role_slots = [(role, i, False) for i, role in enumerate(default_order)]
+
+        # result 열 인덱스도 행과 무관하므로 1회 산정(없으면 토큰 고정 생략)
+        res_col = role_cols.get("result", -1)
+
+        # 숫자 정규화: result 문자열에서 선행 숫자 부분만 추출
+        def _norm_num_str(s: Optional[str]) -> Optional[str]:
+            if not s or not isinstance(s, str):
+                return None
+            t = s.strip().replace("·", ".").replace(",", ".")
+            m = _LEADING_NUM_RE.match(t)
+            return m.group(0) if m else None
+
+        # 라인별 숫자형 토큰 색인(이번 호출 동안만 유지; 키: id(line))
+        # - (x_center, 숫자 문자열, confidence, 원본 토큰) 목록을 라인 순서대로 1회 구성
+        # - 좌표/숫자/신뢰도가 유효하지 않은 토큰은 어떤 우선순위로도 선택되지 않으므로 미리 제외
+        num_tok_cache: Dict[int, List[Tuple[float, str, float, Dict[str, Any]]]] = {}
+
+        def _numeric_tokens(line: Line) -> List[Tuple[float, str, float, Dict[str, Any]]]:
+            key = id(line)
+            cached = num_tok_cache.get(key)
+            if cached is not None:
+                return cached
+            cands: List[Tuple[float, str, float, Dict[str, Any]]] = []
+            if isinstance(line, (list, tuple)):
+                for tok in line:
+                    try:
+                        if not isinstance(tok, dict):
+                            continue
+                        txt = str(tok.get("text", "") or "").strip()
+                        if not txt:
+                            continue
+                        xl = tok.get("x_left"); xr = tok.get("x_right")
+                        if not isinstance(xl, (int, float)) or not isinstance(xr, (int, float)):
+                            continue
+                        conf = tok.get("confidence")
+                        if not isinstance(conf, (int, float)):
+                            continue
+                        # 숫자형만 고려
+                        m = _LEADING_NUM_COMMA_RE.match(txt.replace("·", ".").replace(",", "."))
+                        if not m:
+                            continue
+                        xc = (float(xl) + float(xr)) / 2.0
+                        cands.append((xc, m.group(0).replace(",", "."), float(conf), tok))
+                    except Exception:
+                        continue
+            num_tok_cache[key] = cands
+            return cands
+
         for row in interim_rows:
             cells = list(row.get("_cells") or [])
             if not isinstance(cells, list):
@@ -2834,27 +3347,17 @@ class LabTableExtractor:
                 out["_line_idx"] = line_idx
             src_tokens: Dict[str, Any] = {}
 
-            if header_present:
-                for role, idx in role_to_idx.items():
-                    if 0 <= idx < len(cells_filled):
-                        val = cells_filled[idx]
-                        out[role] = val
-                        # 디버그 미리보기는 min/max를 _src_tokens에서만 표시하므로 보조 입력 제공
-                        if role in ("min", "max") and isinstance(val, str) and val:
-                            src_tokens[role] = {"text": val, "_origin": "geom_banded"}
-            else:
-                # 기본 순서로 첫 4개만 매핑
-                for i, role in enumerate(default_order):
-                    if i < len(cells_filled):
-                        val = cells_filled[i]
-                        out[role] = val
-                        if role in ("min", "max") and isinstance(val, str) and val:
-                            src_tokens[role] = {"text": val, "_origin": "geom_banded"}
+            n_cells = len(cells_filled)
+            for role, idx, is_minmax in role_slots:
+                if idx < n_cells:
+                    val = cells_filled[idx]
+                    out[role] = val
+                    # 디버그 미리보기는 min/max를 _src_tokens에서만 표시하므로 보조 입력 제공
+                    if is_minmax and isinstance(val, str) and val:
+                        src_tokens[role] = {"text": val, "_origin": "geom_banded"}
 
             # 선택된 result 값에 대해, 실제 토큰(_src_tokens['result'])을 Step 8 시점에 고정 저장
             try:
-                res_info = roles_map.get("result") if isinstance(roles_map, dict) else None
-                res_col = int(res_info.get("col_index", -1)) if isinstance(res_info, dict) else -1
                 _res_val = out.get("result")
                 has_result_val = (isinstance(_res_val, str) and _res_val.strip().lower() != "unknown")
                 # 밴드/라인 정보가 있어야 안전하게 찾을 수 있음
@@ -2865,52 +3368,26 @@ class LabTableExtractor:
                         L, R = bands[res_col]
                         line = body_lines[line_idx]
 
-                        # 숫자 정규화: result 문자열에서 선행 숫자 부분만 추출
-                        def _norm_num_str(s: Optional[str]) -> Optional[str]:
-                            if not s or not isinstance(s, str):
-                                return None
-                            t = s.strip().replace("·", ".").replace(",", ".")
-                            m = re.match(r"^[+-]?\d+(?:\.\d+)?", t)
-                            return m.group(0) if m else None
-
                         target_num = _norm_num_str(out.get("result"))
 
                         best_tok = None
                         best_conf = None
                         # 라인 내에서 결과 밴드에 속한 숫자형 토큰을 탐색
-                        if isinstance(line, (list, tuple)):
-                            for tok in line:
-                                try:
-                                    if not isinstance(tok, dict):
-                                        continue
-                                    txt = str(tok.get("text", "") or "").strip()
-                                    if not txt:
-                                        continue
-                                    xl = tok.get("x_left"); xr = tok.get("x_right")
-                                    if not isinstance(xl, (int, float)) or not isinstance(xr, (int, float)):
-                                        continue
-                                    xc = (float(xl) + float(xr)) / 2.0
-                                    if not (L <= xc < R):
-                                        continue
-                                    # 숫자형만 고려
-                                    m = re.match(r"^[+-]?\d+(?:[.,]\d+)?", txt.replace("·", ".").replace(",", "."))
-                                    if not m:
-                                        continue
-                                    num_txt = m.group(0).replace(",", ".")
-                                    conf = tok.get("confidence")
-                                    # 1순위: 숫자값이 target과 정확히 일치하는 토큰
-                                    if target_num and num_txt == target_num and isinstance(conf, (int, float)):
-                                        best_tok = tok
-                                        best_conf = float(conf)
-                                        break
-                                    # 2순위: 밴드 내 숫자형 중 최고 신뢰도
-                                    if isinstance(conf, (int, float)):
-                                        cf = float(conf)
-                                        if best_conf is None or cf > best_conf:
-                                            best_conf = cf
-                                            best_tok = tok
-                                except Exception:
+                        for xc, num_txt, cf, tok in _numeric_tokens(line):
+                            try:
+                                if not (L <= xc < R):
                                     continue
+                                # 1순위: 숫자값이 target과 정확히 일치하는 토큰
+                                if target_num and num_txt == target_num:
+                                    best_tok = tok
+                                    best_conf = cf
+                                    break
+                                # 2순위: 밴드 내 숫자형 중 최고 신뢰도
+                                if best_conf is None or cf > best_conf:
+                                    best_conf = cf
+                                    best_tok = tok
+                            except Exception:
+                                continue
                         if best_tok is not None:
                             # 원본 토큰을 그대로 보존(디버깅 용도)
                             src_tokens.setdefault("result", best_tok)
@@ -2941,75 +3418,66 @@ class LabTableExtractor:
         """
         if not interim_rows:
             return []
+        return [self._split_reference_row(row) for row in interim_rows]
 
-        split_re = re.compile(r"^\s*([+-]?\d+(?:[.,]\d+)?)\s*[\-–~]\s*([+-]?\d+(?:[.,]\d+)?)\s*$")
-
-        def _to_float(s: str) -> Optional[float]:
-            try:
-                s2 = s.replace("·", ".").replace(",", ".").strip()
-                return float(s2)
-            except Exception:
-                return None
-
-        out: List[Dict[str, Any]] = []
-        for row in interim_rows:
+    @staticmethod
+    def _split_reference_row(row: Dict[str, Any]) -> Dict[str, Any]:
+        """_split_reference_range의 행 단위 처리. 변경이 필요할 때만 얕은 복사본을 반환한다."""
+        if not isinstance(row, dict):
+            return row
+        # 변경이 필요한 경우에만 얕은 복사 후 업데이트(그 외에는 원본 행을 그대로 전달)
+        min_val = row.get("min")
+        max_val = row.get("max")
+        has_min = isinstance(min_val, str) and min_val.strip() != ""
+        has_max = isinstance(max_val, str) and max_val.strip() != ""
+        if has_min and has_max:
+            return row
+        ref = row.get("reference")
+        if isinstance(ref, str) and ref.strip():
+            # 9.1 참조값이 UNKNOWN인 경우: min/max도 UNKNOWN으로 채움(없는 항목만)
             try:
-                # 얕은 복사 후 업데이트
-                new_row = dict(row)
-                min_val = new_row.get("min")
-                max_val = new_row.get("max")
-                has_min = isinstance(min_val, str) and min_val.strip() != ""
-                has_max = isinstance(max_val, str) and max_val.strip() != ""
-                if has_min and has_max:
-                    out.append(new_row)
-                    continue
-                ref = new_row.get("reference")
-                if isinstance(ref, str) and ref.strip():
-                    # 9.1 참조값이 UNKNOWN인 경우: min/max도 UNKNOWN으로 채움(없는 항목만)
-                    try:
-                        ref_stripped = ref.strip()
-                        if ref_stripped.lower() == "unknown":
-                            unk = "UNKNOWN"
-                            st = new_row.get("_src_tokens") or {}
-                            if isinstance(st, dict):
-                                st = dict(st)
-                            else:
-                                st = {}
-                            if not has_min:
-                                new_row["min"] = unk
-                                st.setdefault("min", {"text": unk, "_origin": "ref_unknown"})
-                            if not has_max:
-                                new_row["max"] = unk
-                                st.setdefault("max", {"text": unk, "_origin": "ref_unknown"})
-                            new_row["_src_tokens"] = st
-                            out.append(new_row)
-                            continue
-                    except Exception:
-                        # UNKNOWN 처리 중 예외가 나도 일반 분해 로직으로 진행
-                        pass
-                    m = split_re.match(ref)
-                    if m:
-                        a_s, b_s = m.group(1), m.group(2)
-                        a_v = _to_float(a_s)
-                        b_v = _to_float(b_s)
-                        if a_v is not None and b_v is not None:
-                            # 문자열로 유지하되, 숫자로 파싱 가능한 형태는 원문형을 그대로 둠
-                            # 이후 최종 정규화 단계에서 float로 강제 가능
-                            new_row.setdefault("min", a_s)
-                            new_row.setdefault("max", b_s)
-                            # 디버그 출처 표기
-                            st = new_row.get("_src_tokens") or {}
-                            if isinstance(st, dict):
-                                st = dict(st)
-                            else:
-                                st = {}
-                            st.setdefault("min", {"text": a_s, "_origin": "ref_split"})
-                            st.setdefault("max", {"text": b_s, "_origin": "ref_split"})
-                            new_row["_src_tokens"] = st
-                out.append(new_row)
+                ref_stripped = ref.strip()
+                if ref_stripped.lower() == "unknown":
+                    unk = "UNKNOWN"
+                    new_row = dict(row)
+                    st = new_row.get("_src_tokens") or {}
+                    if isinstance(st, dict):
+                        st = dict(st)
+                    else:
+                        st = {}
+                    if not has_min:
+                        new_row["min"] = unk
+                        st.setdefault("min", {"text": unk, "_origin": "ref_unknown"})
+                    if not has_max:
+                        new_row["max"] = unk
+                        st.setdefault("max", {"text": unk, "_origin": "ref_unknown"})
+                    new_row["_src_tokens"] = st
+                    return new_row
             except Exception:
-                out.append(row)
-        return out
+                # UNKNOWN 처리 중 예외가 나도 일반 분해 로직으로 진행
+                pass
+            bounds = _split_ref_bounds(ref)
+            if bounds:
+                a_s, b_s = bounds
+                a_v = _ref_bound_to_float(a_s)
+                b_v = _ref_bound_to_float(b_s)
+                if a_v is not None and b_v is not None:
+                    # 문자열로 유지하되, 숫자로 파싱 가능한 형태는 원문형을 그대로 둠
+                    # 이후 최종 정규화 단계에서 float로 강제 가능
+                    new_row = dict(row)
+                    new_row.setdefault("min", a_s)
+                    new_row.setdefault("max", b_s)
+                    # 디버그 출처 표기
+                    st = new_row.get("_src_tokens") or {}
+                    if isinstance(st, dict):
+                        st = dict(st)
+                    else:
+                        st = {}
+                    st.setdefault("min", {"text": a_s, "_origin": "ref_split"})
+                    st.setdefault("max", {"text": b_s, "_origin": "ref_split"})
+                    new_row["_src_tokens"] = st
+                    return new_row
+        return row
 
     def _to_final_json(self, meta: Dict[str, Any], rows: List[Dict[str, Any]]) -> DocumentResult:
         """중간 행 리스트를 최종 DocumentResult 스키마로 정규화."""
@@ -3026,40 +3494,11 @@ class LabTableExtractor:
         if not rows:
             return doc
 
-        # 선택: 코드별 기대 단위 맵을 1회 생성하여 호환성 확인(있을 때만)
-        code_expected_unit: Dict[str, Optional[str]] = {}
-        try:
-            from .reference.reference_data import REFERENCE_TESTS  # type: ignore
-            # 빌드: code -> canonical unit (REFERENCE_TESTS 기반)
-            # 간단한 정규화 사용
-            def canon_unit(u: Optional[str]) -> Optional[str]:
-                if not u or not isinstance(u, str) or not u.strip():
-                    return None
-                if normalize_unit_simple is None:
-                    return u
-                try:
-                    cu = normalize_unit_simple(u)
-                    return cu or u
-                except Exception:
-                    return u
-            for item in REFERENCE_TESTS:
-                try:
-                    if not isinstance(item, dict):
-                        continue
-                    c = item.get("code")
-                    u = item.get("unit")
-                    if c and c not in code_expected_unit:
-                        code_expected_unit[c] = canon_unit(u)
-                except Exception:
-                    continue
-        except Exception:
-            code_expected_unit = {}
-
         def parse_flag(raw: Optional[str]) -> Optional[str]:
             if not raw or not isinstance(raw, str):
                 return None
             t = raw.strip()
-            m = re.match(r"^[+-]?\d+(?:[.,]\d+)?\s*([HhLlNn])\s*$", t)
+            m = _NUM_FLAG_SUFFIX_RE.match(t)
             if not m:
                 return None
             return m.group(1).upper()
@@ -3074,61 +3513,41 @@ class LabTableExtractor:
 
         tests: List[Dict[str, Any]] = []
         for row in rows:
-            try:
-                code_raw = row.get("name")
-                code_canon = None
-                if isinstance(code_raw, str) and code_raw.strip():
-                    # 한 번 더 보수적으로 해석하여 canonical 코드 확보
-                    try:
-                        code_canon = self._resolve_code(code_raw) or code_raw
-                    except Exception:
-                        code_canon = code_raw
-                # 값/단위
-                unit_raw = row.get("unit") if isinstance(row.get("unit"), str) else None
-                unit_canon = row.get("unit_canonical") if isinstance(row.get("unit_canonical"), str) else None
-                unit_final = unit_canon or unit_raw
-
-                result_norm = row.get("result_norm") if isinstance(row.get("result_norm"), str) else None
-                value = to_float(result_norm) if result_norm else None
-                # flag는 최종 스키마엔 포함하지 않음
-
-                min_norm = row.get("min_norm") if isinstance(row.get("min_norm"), str) else None
-                max_norm = row.get("max_norm") if isinstance(row.get("max_norm"), str) else None
-                ref_min = to_float(min_norm) if min_norm else None
-                ref_max = to_float(max_norm) if max_norm else None
-
-                # 범위/값 검증
-                range_check: Dict[str, Any] = {}
-                if ref_min is not None and ref_max is not None:
-                    range_check["min_le_max"] = bool(ref_min <= ref_max)
-                if value is not None and ref_min is not None and ref_max is not None:
-                    range_check["value_in_range"] = bool(ref_min <= value <= ref_max)
-
-                # 단위 호환성
-                unit_check: Dict[str, Any] = {}
+            if not isinstance(row, dict):
+                continue
+            code_raw = row.get("name")
+            code_canon = None
+            if isinstance(code_raw, str) and code_raw.strip():
+                # 한 번 더 보수적으로 해석하여 canonical 코드 확보
                 try:
-                    expected = code_expected_unit.get(str(code_canon)) if code_canon else None
+                    code_canon = self._resolve_code(code_raw) or code_raw
                 except Exception:
-                    expected = None
-                if expected:
-                    unit_check = {
-                        "expected": expected,
-                        "given": unit_final,
-                        "matches_expected": bool(unit_final == expected),
-                    }
-
-                test_obj: Dict[str, Any] = {
-                    "code": code_canon,
-                    "unit": unit_final,
-                    "reference_min": ref_min,
-                    "reference_max": ref_max,
-                    "value": value,
-                }
-
-                tests.append(test_obj)
-            except Exception:
-                continue
+                    code_canon = code_raw
+            # 값/단위
+            unit_raw = row.get("unit") if isinstance(row.get("unit"), str) else None
+            unit_canon = row.get("unit_canonical") if isinstance(row.get("unit_canonical"), str) else None
+            unit_final = unit_canon or unit_raw
+
+            result_norm = row.get("result_norm") if isinstance(row.get("result_norm"), str) else None
+            value = to_float(result_norm) if result_norm else None
+            # flag는 최종 스키마엔 포함하지 않음
+
+            min_norm = row.get("min_norm") if isinstance(row.get("min_norm"), str) else None
+            max_norm = row.get("max_norm") if isinstance(row.get("max_norm"), str) else None
+            ref_min = to_float(min_norm) if min_norm else None
+            ref_max = to_float(max_norm) if max_norm else None
+
+            # 범위/값 검증·단위 호환성 판정은 최종 스키마에 포함되지 않으므로 수행하지 않음
+
+            test_obj: Dict[str, Any] = {
+                "code": code_canon,
+                "unit": unit_final,
+                "reference_min": ref_min,
+                "reference_max": ref_max,
+                "value": value,
+            }
 
+            tests.append(test_obj)
         doc["tests"] = tests
         return doc
 
@@ -3136,7 +3555,7 @@ class LabTableExtractor:
     # Step 9: Truncate rows to header column count
     # -----------------------
     def _truncate_to_header_columns(
-        self, rows: List[Dict[str, Any]], header_roles: Any
+        self, rows: List[Dict[str, Any]], header_roles: Any, *, col_count: Optional[int] = None
     ) -> List[Dict[str, Any]]:
         """헤더 역할(col_index)에 정의된 컬럼 수를 초과하는 셀은 뒤에서 제거하여 맞춘다.
 
@@ -3153,24 +3572,24 @@ class LabTableExtractor:
         if not rows:
             return []
 
-        # 기준 열 수 계산
-        K = None
-        try:
-            roles_map = self._roles_to_mapping(header_roles)
-            if roles_map:
-                max_idx = -1
-                for role, info in roles_map.items():
-                    if isinstance(info, dict) and "col_index" in info:
-                        try:
-                            ci = int(info.get("col_index", -1))
-                            if ci > max_idx:
-                                max_idx = ci
-                        except Exception:
-                            continue
-                if max_idx >= 0:
-                    K = max_idx + 1
-        except Exception:
-            K = None
+        K = self._header_column_count(rows, header_roles, col_count=col_count)
+        if K is None:
+            return rows
+        return [self._truncate_row(row, K) for row in rows]
+
+    def _header_column_count(
+        self, rows: List[Dict[str, Any]], header_roles: Any, *, col_count: Optional[int] = None
+    ) -> Optional[int]:
+        """Step 9 기준 열 수 K(헤더 col_index 최댓값+1, 없으면 첫 행 셀 수). 산정 실패/0 이하면 None.
+
+        col_count: 호출 측이 _max_col_count로 미리 산정한 헤더 열 수(있으면 재산정 생략).
+        """
+        K = col_count
+        if K is None:
+            try:
+                K = self._max_col_count(header_roles)
+            except Exception:
+                K = None
         if K is None:
             # 헤더 정보 없으면 첫 행 기준으로 사용
             try:
@@ -3180,28 +3599,27 @@ class LabTableExtractor:
             except Exception:
                 K = None
         if not isinstance(K, int) or K <= 0:
-            return rows
+            return None
+        return K
 
-        out: List[Dict[str, Any]] = []
-        for row in rows:
-            try:
-                new_row = dict(row)
-                cells = list(new_row.get("_cells") or []) if isinstance(new_row.get("_cells"), list) else []
-                if len(cells) > K:
-                    dropped = cells[K:]
-                    cells = cells[:K]
-                    new_row["_cells"] = cells
-                    # 추적 정보
-                    new_row["_row_fix"] = "truncate_tail"
-                    existing = new_row.get("_dropped_extra")
-                    if isinstance(existing, list):
-                        new_row["_dropped_extra"] = existing + dropped
-                    else:
-                        new_row["_dropped_extra"] = dropped
-                out.append(new_row)
-            except Exception:
-                out.append(row)
-        return out
+    @staticmethod
+    def _truncate_row(row: Dict[str, Any], K: int) -> Dict[str, Any]:
+        """_truncate_to_header_columns의 행 단위 처리. 잘라낼 셀이 있을 때만 복사본을 반환한다."""
+        # 잘라낼 셀이 없는 행(비정상 행 포함)은 복사 없이 그대로 전달
+        cells = row.get("_cells") if isinstance(row, dict) else None
+        if not isinstance(cells, list) or len(cells) <= K:
+            return row
+        new_row = dict(row)
+        dropped = cells[K:]
+        new_row["_cells"] = cells[:K]
+        # 추적 정보
+        new_row["_row_fix"] = "truncate_tail"
+        existing = new_row.get("_dropped_extra")
+        if isinstance(existing, list):
+            new_row["_dropped_extra"] = existing + dropped
+        else:
+            new_row["_dropped_extra"] = dropped
+        return new_row
 
     # -----------------------
     # Step 11: Unit/Result normalization
@@ -3225,58 +3643,73 @@ class LabTableExtractor:
         if not rows:
             return []
 
-        def _norm_number_str(val: str) -> Optional[str]:
-            if not isinstance(val, str):
-                return None
-            t = val.strip()
-            if not t or t.upper() == "UNKNOWN":
-                return None
-            # 숫자+플래그(H/L/N) 꼬리 제거
-            m = re.match(r"^\s*([+-]?\d+(?:[.,]\d+)?)(?:[HhLlNn])?\s*$", t)
-            if not m:
-                return None
-            num = m.group(1).replace("·", ".").replace(",", ".")
-            # 유효성 확인
-            try:
-                float(num)
-            except Exception:
-                return None
-            return num
-
         out: List[Dict[str, Any]] = []
         for row in rows:
             try:
-                new_row = dict(row)
-                # Unit canonical - 최종 정규화(단일 지점)
-                u = new_row.get("unit")
-                if isinstance(u, str) and u.strip() and u.upper() != "UNKNOWN" and normalize_unit_simple is not None:
-                    try:
-                        cu = normalize_unit_simple(u)
-                        if cu:
-                            new_row["unit_canonical"] = cu
-                    except Exception:
-                        pass
-
-                # Result number
-                r = new_row.get("result")
-                rn = _norm_number_str(r) if isinstance(r, str) else None
-                if rn is not None:
-                    new_row["result_norm"] = rn
-
-                # Min/Max numeric strings
-                mn = new_row.get("min")
-                mx = new_row.get("max")
-                mnn = _norm_number_str(mn) if isinstance(mn, str) else None
-                mxn = _norm_number_str(mx) if isinstance(mx, str) else None
-                if mnn is not None:
-                    new_row["min_norm"] = mnn
-                if mxn is not None:
-                    new_row["max_norm"] = mxn
-
-                out.append(new_row)
+                out.append(self._normalize_row(row))
             except Exception:
                 out.append(row)
+        return out
+
+    @staticmethod
+    def _normalize_row(row: Dict[str, Any]) -> Dict[str, Any]:
+        """_normalize_unit_and_result의 행 단위 처리. 추가할 정규화 필드가 있을 때만 복사본을 반환한다."""
+        # Unit canonical - 최종 정규화(단일 지점)
+        cu = None
+        u = row.get("unit")
+        if isinstance(u, str) and u.strip() and u.upper() != "UNKNOWN" and normalize_unit_simple is not None:
+            try:
+                cu = normalize_unit_simple(u)
+            except Exception:
+                cu = None
+
+        # Result number / Min/Max numeric strings (UNKNOWN·빈 값은 즉시 None)
+        r = row.get("result")
+        rn = _norm_number_str(r) if isinstance(r, str) else None
+        mn = row.get("min")
+        mx = row.get("max")
+        mnn = _norm_number_str(mn) if isinstance(mn, str) else None
+        mxn = _norm_number_str(mx) if isinstance(mx, str) else None
+
+        # 추가할 필드가 없으면(예: UNKNOWN 위주 행) 복사 없이 그대로 전달
+        if not cu and rn is None and mnn is None and mxn is None:
+            return row
+
+        new_row = dict(row)
+        if cu:
+            new_row["unit_canonical"] = cu
+        if rn is not None:
+            new_row["result_norm"] = rn
+        if mnn is not None:
+            new_row["min_norm"] = mnn
+        if mxn is not None:
+            new_row["max_norm"] = mxn
+        return new_row
+
+    # -----------------------
+    # Step 9~11 fused: 최종 행 변환(중간 목록 없이 1패스)
+    # -----------------------
+    def _finalize_rows(
+        self, filled_rows: List[Dict[str, Any]], header_roles: Any, *, col_count: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Step 9(열 수 맞춤) → 10(참조범위 분리) → 11(단위/숫자 정규화)을 행마다 한 번에 적용.
 
+        단계별 메서드와 같은 행 단위 처리를 공유하므로 결과가 같으며, 단계별 중간 목록을
+        만들지 않는다. 인터미디엇(디버그) 출력이 필요 없을 때 사용한다.
+        """
+        if not filled_rows:
+            return []
+        K = self._header_column_count(filled_rows, header_roles, col_count=col_count)
+        out: List[Dict[str, Any]] = []
+        for row in filled_rows:
+            if K is not None:
+                row = self._truncate_row(row, K)
+            row = self._split_reference_row(row)
+            try:
+                row = self._normalize_row(row)
+            except Exception:
+                pass
+            out.append(row)
         return out
 
     # -----------------------
@@ -3310,6 +3743,8 @@ class LabTableExtractor:
             scan_all = intermediates.get("code_resolve_scan_all") or []
 
             out: List[str] = []
+            # 라인 수만큼 반복되는 루프에서 쓰는 append 바인딩(속성 조회 1회)
+            add = out.append
             if body_start is None:
                 out.append("❌ 바디 시작 라인을 찾지 못했습니다.")
                 # 스캔 미리보기 표시: idx, 첫 토큰, 해석 코드
@@ -3317,7 +3752,7 @@ class LabTableExtractor:
                     if debug_preview:
                         out.append("\n🔎 바디 시작 판별을 위해 스캔한 라인:")
                         for i, (idx0, first, resolved) in enumerate(debug_preview, 1):
-                            out.append(f"  {i}. idx={idx0} first={first!r} resolved={resolved!r}")
+                            add(f"  {i}. idx={idx0} first={first!r} resolved={resolved!r}")
                 except Exception:
                     pass
                 # 문서 전체 기준 코드 인식 실패 라인
@@ -3327,7 +3762,7 @@ class LabTableExtractor:
                         any_printed = False
                         for idx0, first, resolved, full in scan_all:
                             if not resolved:
-                                out.append(f" - line#{idx0}: first={first!r} | full='{full}'")
+                                add(f" - line#{idx0}: first={first!r} | full='{full}'")
                                 any_printed = True
                         if not any_printed:
                             out.append(" (없음)")
@@ -3338,85 +3773,77 @@ class LabTableExtractor:
             out.append(f"✅ 바디 시작 인덱스: {body_start}")
             out.append(f"📦 바디 라인 수: {len(body_lines)}")
 
+            # full 텍스트 → 원본 라인 인덱스 역색인(첫 등장 우선) — line_index 없는 라인의 역추적용
+            full_to_idx: Dict[str, Any] = {}
+            try:
+                for _i, _f, _r, _full in scan_all:
+                    full_to_idx.setdefault(_full, _i)
+            except Exception:
+                pass
+
             # 바디 라인 미리보기 (요청 형식: "- line#<실제번호>: <내용>")
             out.append("\n🔎 바디 라인 미리보기:")
+            # 이 호출 동안만 유지하는 조인 텍스트 메모(미리보기 값을 바디 인덱스 역추적에서 재사용)
+            join_memo: Dict[Tuple[int, str], str] = {}
             for line in body_lines:
                 try:
                     # 실제 원본 라인 인덱스 탐색: 우선 첫 토큰의 'line_index' 필드 사용
-                    idx0 = None
-                    if isinstance(line, (list, tuple)) and len(line) > 0 and isinstance(line[0], dict):
-                        idx0 = line[0].get("line_index")
+                    idx0 = _first_token_line_index(line)
 
-                    joined = self._line_join_texts(line)
+                    joined = self._memo_join_texts(join_memo, line)
 
                     # 보조: scan_all에서 full 텍스트 일치로 역추적
                     if idx0 is None:
-                        try:
-                            for _i, _f, _r, _full in scan_all:
-                                if _full == joined:
-                                    idx0 = _i
-                                    break
-                        except Exception:
-                            pass
+                        idx0 = full_to_idx.get(joined)
 
                     prefix = f" - line#{idx0}:" if idx0 is not None else " - line#?:"
                     # 코드 중복 표시 제거: joined 자체에 첫 토큰(정규화된 코드)이 포함되므로 first는 출력하지 않음
-                    out.append(f"{prefix} {joined}")
+                    add(f"{prefix} {joined}")
                 except Exception:
-                    out.append(" - <미리보기 실패>")
+                    add(" - <미리보기 실패>")
 
             # 전체 라인 구조 출력(옵션)
             if show_full_lines:
                 out.append("\n📋 바디 라인 전체(원본 구조):")
                 for i, line in enumerate(body_lines, 1):
                     try:
-                        out.append(f"  {i}. {line}")
+                        add(f"  {i}. {line}")
                     except Exception:
-                        out.append(f"  {i}. <표시 실패>")
+                        add(f"  {i}. <표시 실패>")
 
             # 문서 전체 기준 코드 인식 실패 라인 (바디 제외)
             try:
                 if scan_all:
                     # 바디에 포함된 실제 라인 인덱스 집합 계산
-                    body_idx_set: set[int] = set()
+                    def _body_line_idx(bl: Any) -> Any:
+                        # 첫 토큰의 line_index 우선, 없으면 full 텍스트 역색인 조회(O(1))
+                        _idx = _first_token_line_index(bl)
+                        if _idx is None:
+                            _idx = full_to_idx.get(self._memo_join_texts(join_memo, bl))
+                        return _idx
+
+                    body_idx_set: set[int]
                     try:
-                        for bl in body_lines:
-                            _idx = None
-                            if isinstance(bl, (list, tuple)) and len(bl) > 0 and isinstance(bl[0], dict):
-                                _idx = bl[0].get("line_index")
-                            if _idx is None:
-                                # fallback: full 텍스트 매칭
-                                _full = self._line_join_texts(bl)
-                                for _i, _f, _r, _full2 in scan_all:
-                                    if _full2 == _full:
-                                        _idx = _i
-                                        break
-                            if _idx is not None:
-                                body_idx_set.add(int(_idx))
+                        body_idx_set = {int(_idx) for _idx in map(_body_line_idx, body_lines) if _idx is not None}
                     except Exception:
                         body_idx_set = set()
 
-                    out.append("\n🧹 코드 인식 실패 라인 목록 (문서 전체):")
-                    any_printed = False
+                    # scan_all 1회 순회로 '코드 인식 실패'와 '바디 외 라인' 두 목록을 함께 수집
+                    fail_lines: List[str] = []
+                    non_body_lines: List[str] = []
                     for idx0, first, resolved, full in scan_all:
-                        if (idx0 not in body_idx_set) and (not resolved):
-                            out.append(f" - line#{idx0}: first={first!r} | full='{full}'")
-                            any_printed = True
-                    if not any_printed:
-                        out.append(" (없음)")
+                        if idx0 in body_idx_set:
+                            continue
+                        non_body_lines.append(f" - line#{idx0}: {full}")
+                        if not resolved:
+                            fail_lines.append(f" - line#{idx0}: first={first!r} | full='{full}'")
+
+                    out.append("\n🧹 코드 인식 실패 라인 목록 (문서 전체):")
+                    out.extend(fail_lines or [" (없음)"])
 
                     # 추가: 바디에 포함되지 않은 라인 전체(성공/실패 무관) 목록
-                    try:
-                        out.append("\n🗂 바디에 포함되지 않은 라인 (문서 전체):")
-                        any_non_body = False
-                        for idx0, _first, _resolved, full in scan_all:
-                            if idx0 not in body_idx_set:
-                                out.append(f" - line#{idx0}: {full}")
-                                any_non_body = True
-                        if not any_non_body:
-                            out.append(" (없음)")
-                    except Exception:
-                        pass
+                    out.append("\n🗂 바디에 포함되지 않은 라인 (문서 전체):")
+                    out.extend(non_body_lines or [" (없음)"])
             except Exception:
                 pass
 
@@ -3451,7 +3878,7 @@ class LabTableExtractor:
             idx = intermediates.get("header_index")
             header_line = intermediates.get("header_line")
             header_roles = intermediates.get("header_roles")
-            roles_map = self._roles_to_mapping(header_roles)
+            roles_map = self._debug_roles_map(header_roles)
             header_valid = intermediates.get("header_valid")
             header_source = intermediates.get("header_source", "unknown")
             body_lines_count = intermediates.get("body_lines_count")
@@ -3459,6 +3886,8 @@ class LabTableExtractor:
             pre_llm_policy_valid = intermediates.get("pre_llm_policy_valid")
             llm_triggered = bool(intermediates.get("llm_triggered"))
             llm_trigger_cause = intermediates.get("llm_trigger_cause")
+            llm_input_sample = intermediates.get("llm_input_sample") or []
+            inferred_input_sample = intermediates.get("inferred_input_sample") or []
 
             out: List[str] = []
             if idx is None:
@@ -3481,28 +3910,15 @@ class LabTableExtractor:
                     out.append("🖹 헤더 텍스트: <표시 실패>")
 
             # 유효성/역할 수 + 정책 기반 검사 결과도 함께 표기
-            try:
-                distinct = len([r for r in roles_map.keys() if roles_map.get(r)]) if isinstance(roles_map, dict) else 0
-            except Exception:
-                distinct = 0
+            distinct = sum(1 for info in roles_map.values() if info)
             # 기존 플래그 우선, 없으면 distinct 기반 추정
             valid = bool(header_valid) if header_valid is not None else (distinct >= int(self.settings.role_min_distinct_hits))
-            # 정책(필수 역할) 기반 재평가: name+unit+result 필수, reference 또는 (min/max) 필요
-            policy_valid = False
-            if isinstance(roles_map, dict) and roles_map:
-                has_name = bool(roles_map.get("name"))
-                has_unit = bool(roles_map.get("unit"))
-                res = roles_map.get("result") or {}
-                has_result = bool(res)
-                has_reference_like = bool(roles_map.get("reference") or (roles_map.get("min") and roles_map.get("max")))
-                policy_valid = has_name and has_unit and has_result and has_reference_like
-            out.append(f"✅ 헤더 유효성: {valid} (roles={distinct}, threshold={self.settings.role_min_distinct_hits}) | 정책기준: {policy_valid} (필수: name+unit+result + ref|min/max)")
 
             # 유효성 실패 사유 상세 계산 도우미
-            def _policy_and_reasons(roles_dict: Dict[str, Any]) -> Tuple[bool, List[str]]:
+            # rm: 이미 _roles_to_mapping을 거친 매핑(호출 측에서 1회만 변환)
+            def _policy_and_reasons(rm: Dict[str, Dict[str, Any]]) -> Tuple[bool, List[str]]:
                 pol_valid = False
                 reasons: List[str] = []
-                rm = self._roles_to_mapping(roles_dict)
                 if isinstance(rm, dict) and rm:
                     has_name = bool(rm.get("name"))
                     has_unit = bool(rm.get("unit"))
@@ -3520,7 +3936,8 @@ class LabTableExtractor:
 
                     def _thr_reason(role: str, base_thresh: float) -> None:
                         info = rm.get(role) or {}
-                        if isinstance(info, dict) and info:
+                        # rm의 값은 _roles_to_mapping이 만든 일반 dict이므로 타입 동일성으로 검사
+                        if type(info) is dict and info:
                             meets = info.get("meets_threshold")
                             if meets is False:
                                 conf = info.get("confidence")
@@ -3538,36 +3955,42 @@ class LabTableExtractor:
                         pass
                 return pol_valid, reasons
 
+            # 정책(필수 역할) 기반 재평가: name+unit+result 필수, reference 또는 (min/max) 필요
+            # (판정과 실패 사유를 한 번에 계산해 아래 사유 출력에서 재사용)
+            policy_valid, policy_reasons = _policy_and_reasons(roles_map)
+            out.append(f"✅ 헤더 유효성: {valid} (roles={distinct}, threshold={self.settings.role_min_distinct_hits}) | 정책기준: {policy_valid} (필수: name+unit+result + ref|min/max)")
+
             # 현재 header_roles에 대한 사유 출력
             if not policy_valid:
-                _, reasons = _policy_and_reasons(roles_map)
-                if reasons:
+                if policy_reasons:
                     out.append("\n❌ 유효성 실패 사유:")
-                    for r in reasons:
+                    for r in policy_reasons:
                         out.append(f" - {r}")
 
             # 역할 매핑 상세 출력 도우미
-            def _render_roles(title: str, roles_dict: Dict[str, Any]) -> List[str]:
+            def _render_roles(title: str, rm: Dict[str, Dict[str, Any]]) -> List[str]:
                 lines: List[str] = []
-                rm = self._roles_to_mapping(roles_dict)
                 if isinstance(rm, dict) and rm:
                     lines.append(f"\n{title}")
-                    def _col_i(v: Any) -> int:
-                        try:
-                            return int(v.get("col_index", -1)) if isinstance(v, dict) else -1
-                        except Exception:
-                            return -1
-                    for role, info in sorted(rm.items(), key=lambda kv: _col_i(kv[1])):
-                        if not isinstance(info, dict):
+                    # 정렬 키(col_index)를 먼저 한 번씩 계산해 두고 키만으로 안정 정렬
+                    keyed: List[Tuple[int, str, Any]] = []
+                    # (_roles_to_mapping의 info는 col_index:int를 항상 가짐)
+                    for role, info in rm.items():
+                        ci = info.get("col_index", -1) if type(info) is dict else -1
+                        keyed.append((ci, role, info))
+                    keyed.sort(key=_first_item)
+                    for _ci, role, info in keyed:
+                        if type(info) is not dict:
                             lines.append(f" - {role}: <정보 없음>")
                             continue
+                        # 이하 info는 dict로 확정됨
                         label = info.get("label")
                         col_index = info.get("col_index")
                         hits = info.get("hits") or []
                         conf = info.get("confidence")
-                        forced = info.get("forced") if isinstance(info, dict) else False
+                        forced = info.get("forced")
                         forced_tag = " forced=True" if forced else ""
-                        meets = info.get("meets_threshold") if isinstance(info, dict) else None
+                        meets = info.get("meets_threshold")
                         meets_tag = f" meets_threshold={meets}" if meets is not None else ""
                         lines.append(f" - {role}: label={label!r} col_index={col_index} hits={hits} conf={conf}{forced_tag}{meets_tag}")
                 return lines
@@ -3578,20 +4001,17 @@ class LabTableExtractor:
                 cause_text = "정책 기준 미달" if llm_trigger_cause == "policy_invalid" else ("규칙 기반 헤더 미검출" if llm_trigger_cause == "no_rule_header" else "기타")
                 out.append(f"\n🤖 LLM 백업 사용: {cause_text}")
                 # 사전(규칙 기반) 결과의 정책 판단과 사유
-                pre_valid, pre_reasons = _policy_and_reasons(pre_llm_roles)
+                pre_llm_map = self._roles_to_mapping(pre_llm_roles)
+                pre_valid, pre_reasons = _policy_and_reasons(pre_llm_map)
                 out.append(f"➡️ 규칙 기반 추론(LLM 전) 정책기준: {pre_valid}")
                 if not pre_valid and pre_reasons:
                     out.append("사유:")
                     for r in pre_reasons:
                         out.append(f" - {r}")
                 # 역할 매핑 렌더링
-                out.extend(_render_roles("\n🔁 규칙 기반 추론 결과(LLM 호출 전):", pre_llm_roles))
+                out.extend(_render_roles("\n🔁 규칙 기반 추론 결과(LLM 호출 전):", pre_llm_map))
 
                 # LLM에 전달된 입력 샘플 출력(있을 경우)
-                try:
-                    llm_input_sample = intermediates.get("llm_input_sample") or []
-                except Exception:
-                    llm_input_sample = []
                 if llm_input_sample:
                     out.append("\n📥 LLM 입력 샘플 행:")
                     try:
@@ -3612,16 +4032,14 @@ class LabTableExtractor:
 
             # 헤더 출처가 inferred인 경우, 규칙 기반 추론에 사용된 입력 샘플도 표시
             try:
-                if header_source == "inferred":
-                    inferred_input_sample = intermediates.get("inferred_input_sample") or []
-                    if inferred_input_sample:
-                        out.append("\n🧪 규칙 기반 추론 입력 샘플 행:")
-                        for i, row in enumerate(inferred_input_sample, 1):
-                            try:
-                                row_str = ", ".join([str(x) for x in row])
-                            except Exception:
-                                row_str = str(row)
-                            out.append(f"  {i}. [ {row_str} ]")
+                if header_source == "inferred" and inferred_input_sample:
+                    out.append("\n🧪 규칙 기반 추론 입력 샘플 행:")
+                    for i, row in enumerate(inferred_input_sample, 1):
+                        try:
+                            row_str = ", ".join([str(x) for x in row])
+                        except Exception:
+                            row_str = str(row)
+                        out.append(f"  {i}. [ {row_str} ]")
             except Exception:
                 pass
 
@@ -3680,9 +4098,9 @@ class LabTableExtractor:
                     lines.append(f" - {field}: 후보 없음")
                     return lines
                 # 점수 내림차순 상위 K개
+                # (동점 후보는 기존 '오름차순 정렬 후 뒤집기'와 같은 순서가 되도록 역순 입력을 안정 정렬)
                 try:
-                    items = sorted(items, key=lambda x: float(x.get("score", 0.0)))
-                    items = list(reversed(items))
+                    items = sorted(reversed(items), key=lambda x: float(x.get("score", 0.0)), reverse=True)
                 except Exception:
                     pass
                 top = items[: max(0, int(show_top_k))]
@@ -3725,11 +4143,16 @@ class LabTableExtractor:
             if not isinstance(intermediates, dict):
                 return f"⚠️ intermediates 타입 이상: {type(intermediates)}"
 
+            # 필요한 키를 한 번만 읽어 로컬로 사용
+            step8_dbg = intermediates.get("step8_debug") or {}
+            body_lines = intermediates.get("body_lines") or []
+            filled = intermediates.get("filled_rows") or []
+            header_roles = intermediates.get("header_roles") or {}
+            header_source = intermediates.get("header_source") or "unknown"
+
             # 샘플 요약(먼저 표시)
             out: List[str] = []
             try:
-                step8_dbg = intermediates.get("step8_debug") or {}
-                body_lines = intermediates.get("body_lines") or []
                 sample_idx_list = step8_dbg.get("sample_body_indices") or []
                 K = step8_dbg.get("K")
                 sc = step8_dbg.get("sample_count")
@@ -3737,14 +4160,14 @@ class LabTableExtractor:
                 out.append(f" - K={K} | sample_count={sc}")
                 if sample_idx_list:
                     out.append(" - 샘플 라인:")
+                    # 같은 라인이 여러 번 샘플링돼도 조인은 한 번만(이 호출 동안만 유지)
+                    join_memo: Dict[Tuple[int, str], str] = {}
                     for bi in sample_idx_list:
                         try:
                             # 원본 라인 인덱스 추출 시도
-                            orig_idx = None
                             line = body_lines[bi] if 0 <= int(bi) < len(body_lines) else None
-                            if isinstance(line, (list, tuple)) and len(line) > 0 and isinstance(line[0], dict):
-                                orig_idx = line[0].get("line_index")
-                            preview = self._line_join_texts(line) if line is not None else ""
+                            orig_idx = _first_token_line_index(line)
+                            preview = self._memo_join_texts(join_memo, line) if line is not None else ""
                             prefix = f"   - line#{orig_idx}" if orig_idx is not None else "   - line#?"
                             out.append(f"{prefix}: {preview}")
                         except Exception:
@@ -3755,44 +4178,30 @@ class LabTableExtractor:
                 # 샘플 요약 실패 시 무시하고 계속
                 pass
 
-            filled = intermediates.get("filled_rows") or []
             if not filled:
                 out.append("\nℹ️ filled_rows 비어있음 (Step 8 미실행 또는 헤더 스코프 불일치)")
                 return "\n".join(out)
 
             # 1) 헤더/역할 구성: 실제 헤더 순서를 따르는 동적 컬럼 구성
-            header_roles = intermediates.get("header_roles") or {}
             # 표준화된 header_roles(list/any)를 roles mapping으로 변환하여 일관 사용
-            try:
-                roles_map = self._roles_to_mapping(header_roles)
-            except Exception:
-                roles_map = {}
-            header_source = intermediates.get("header_source") or "unknown"
+            # (_roles_to_mapping은 실패 시 {}를 반환하며, 값은 col_index:int가 보장된 dict)
+            roles_map = self._debug_roles_map(header_roles)
 
             def _role_label(role: str, default_label: str) -> str:
-                try:
-                    roles_map = self._roles_to_mapping(header_roles)
-                    info = roles_map.get(role) if isinstance(roles_map, dict) else None
-                    if header_source == "ocr" and isinstance(info, dict):
-                        lab = info.get("label")
-                        # 'inferred'/'llm' 같은 내부 라벨은 무시하고, 실제 텍스트일 때만 사용
-                        if isinstance(lab, str) and lab.strip() and lab.lower() not in ("inferred", "llm"):
-                            return lab.strip()
-                except Exception:
-                    pass
+                info = roles_map.get(role)
+                if header_source == "ocr" and info:
+                    lab = info.get("label")
+                    # 'inferred'/'llm' 같은 내부 라벨은 무시하고, 실제 텍스트일 때만 사용
+                    if isinstance(lab, str) and lab.strip() and lab.lower() not in ("inferred", "llm"):
+                        return lab.strip()
                 return default_label
 
             # 헤더에 정의된 역할을 col_index 순으로 정렬하고 표시 가능한 역할만 선택
             def _col_index_for(role: str) -> int:
-                try:
-                    roles_map = self._roles_to_mapping(header_roles)
-                    info = roles_map.get(role) if isinstance(roles_map, dict) else None
-                    return int(info.get("col_index", 10**6)) if isinstance(info, dict) else 10**6
-                except Exception:
-                    return 10**6
+                info = roles_map.get(role)
+                return info["col_index"] if info else 10**6
 
-            roles_map = self._roles_to_mapping(header_roles)
-            roles_present = [r for r in ["name", "unit", "reference", "min", "max", "result"] if isinstance(roles_map, dict) and roles_map.get(r)]
+            roles_present = [r for r in _DEBUG_ROLE_ORDER if roles_map.get(r)]
             roles_present.sort(key=_col_index_for)
 
             # reference vs (min,max) 충돌 시 min/max를 우선(문서 스키마 보존). 중복 제거.
@@ -3806,94 +4215,51 @@ class LabTableExtractor:
             # 2) 값 추출 도우미 (min/max는 src_token 우선, 없으면 reference 분해)
             rows = filled
 
-            def _disp(v: Any) -> str:
-                try:
-                    if v is None:
-                        return "UNKNOWN"
-                    s = str(v)
-                    if not s.strip():
-                        return "UNKNOWN"
-                    return s
-                except Exception:
-                    return "UNKNOWN"
-
-            range_split_re = re.compile(r"\s*[-–~]\s*")
-
             def _cell_value(row: Dict[str, Any], role: str) -> str:
                 try:
                     if role in ("name", "unit", "result", "reference"):
-                        return _disp(row.get(role))
+                        return _debug_disp(row.get(role))
                     if role in ("min", "max"):
                         # 헤더가 min/max인 경우, 값은 항상 분리되어 있다고 가정하므로
                         # src_tokens의 해당 토큰만 사용하고, reference 분해는 시도하지 않는다.
                         st = row.get("_src_tokens") or {}
                         tok = st.get(role)
                         if isinstance(tok, dict):
-                            return _disp(tok.get("text"))
+                            return _debug_disp(tok.get("text"))
                         return ""
                 except Exception:
                     return ""
                 return ""
 
             # 3) 컬럼 라벨/정렬/폭 계산
-            labels = []
-            align_right = set(["result", "min", "max"])  # 숫자 열 우측 정렬
-            for role in roles_present:
-                if role == "name":
-                    labels.append(_role_label("name", "Name"))
-                elif role == "unit":
-                    labels.append(_role_label("unit", "Unit"))
-                elif role == "reference":
-                    labels.append(_role_label("reference", "Reference"))
-                elif role == "min":
-                    labels.append(_role_label("min", "Min"))
-                elif role == "max":
-                    labels.append(_role_label("max", "Max"))
-                elif role == "result":
-                    labels.append(_role_label("result", "Result"))
+            align_right = _DEBUG_ALIGN_RIGHT_ROLES  # 숫자 열 우측 정렬
+            labels = [_role_label(role, _DEBUG_ROLE_DEFAULT_LABEL[role]) for role in roles_present]
+
+            # 셀 문자열을 한 번만 만들어 폭 계산과 렌더링에 함께 사용
+            rendered: List[List[str]] = [[_cell_value(r, role) for role in roles_present] for r in rows]
 
             # 폭 계산
-            col_widths: List[int] = []
-            for idx, role in enumerate(roles_present):
-                width = len(labels[idx])
-                for r in rows:
-                    width = max(width, len(_cell_value(r, role)))
-                col_widths.append(width)
-
-            # 한 행 포맷터
-            def _fmt_cells(cells: List[str]) -> str:
-                parts = []
-                for i, val in enumerate(cells):
-                    role = roles_present[i]
-                    w = col_widths[i]
-                    if role in align_right:
-                        parts.append(val.rjust(w))
-                    else:
-                        parts.append(val.ljust(w))
-                return " | ".join(parts)
+            col_widths: List[int] = [
+                max(len(labels[idx]), max((len(cells[idx]) for cells in rendered), default=0))
+                for idx in range(len(roles_present))
+            ]
+
+            # 한 행 포맷터(열 정렬/폭 고정 템플릿)
+            fmt_cells = _row_format(roles_present, col_widths, align_right)
 
-            # 구분선 생성
-            def _sep_line() -> str:
-                parts = ["-" * w for w in col_widths]
-                return "-+-".join(parts)
+            # 구분선
+            sep_line = "-+-".join(["-" * w for w in col_widths])
 
             # 4) 테이블 렌더링
             out.append("")
             out.append("🧩 Step 8: Filling 결과 (정렬된 표, 전체)")
-            out.append(_fmt_cells(labels))
-            out.append(_sep_line())
-            for r in rows:
-                try:
-                    cells = [_cell_value(r, role) for role in roles_present]
-                    out.append(_fmt_cells(cells))
-                except Exception:
-                    out.append("<표시 실패>")
+            out.append(fmt_cells(*labels))
+            out.append(sep_line)
+            # 셀은 모두 _cell_value가 만든 str이라 format이 실패할 수 없음
+            out.extend(fmt_cells(*cells) for cells in rendered)
 
-            try:
-                out.append("")
-                out.append(f"(header_source={header_source})")
-            except Exception:
-                pass
+            out.append("")
+            out.append(f"(header_source={header_source})")
 
             return "\n".join(out)
         except Exception as e:
@@ -3918,48 +4284,26 @@ class LabTableExtractor:
             if not rows:
                 return "ℹ️ step9_rows 비어있음 (Step 9 미실행 또는 이전 단계 결과 없음)"
 
-            def _s(v: Any) -> str:
-                try:
-                    if v is None:
-                        return ""
-                    return str(v)
-                except Exception:
-                    return ""
-
             # 기본 레이아웃(Name | Reference | Result | Unit)로 보여줌
             labels = ["Name", "Reference", "Result", "Unit", "_fix"]
             data: List[List[str]] = []
             for r in rows:
                 data.append([
-                    _s(r.get("name")),
-                    _s(r.get("reference")),
-                    _s(r.get("result")),
-                    _s(r.get("unit")),
-                    _s(r.get("_row_fix")),
+                    _debug_str(r.get("name")),
+                    _debug_str(r.get("reference")),
+                    _debug_str(r.get("result")),
+                    _debug_str(r.get("unit")),
+                    _debug_str(r.get("_row_fix")),
                 ])
 
-            # 열 폭 계산 및 정렬
-            widths = [len(l) for l in labels]
-            for row in data:
-                for i, v in enumerate(row):
-                    widths[i] = max(widths[i], len(v))
-
-            def fmt_row(cells: List[str]) -> str:
-                parts = []
-                for i, v in enumerate(cells):
-                    if labels[i] in ("Result",):
-                        parts.append(v.rjust(widths[i]))
-                    else:
-                        parts.append(v.ljust(widths[i]))
-                return " | ".join(parts)
+            # 열 폭 계산 및 정렬: 라벨과 데이터를 열 단위로 묶어 C 수준 map/max로 계산
+            widths = [max(map(len, col)) for col in zip(labels, *data, strict=True)]
+
+            fmt_row = _row_format(labels, widths, _DEBUG_RIGHT_ALIGN_LABELS)
 
             sep = "-+-".join(["-" * w for w in widths])
-            out: List[str] = []
-            out.append("🧪 Step 9: 행 길이 정규화(뒤에서 자르기) 결과(전체)")
-            out.append(fmt_row(labels))
-            out.append(sep)
-            for row in data:
-                out.append(fmt_row(row))
+            out: List[str] = ["🧪 Step 9: 행 길이 정규화(뒤에서 자르기) 결과(전체)", fmt_row(*labels), sep]
+            out.extend(fmt_row(*row) for row in data)
             return "\n".join(out)
         except Exception as e:
             return f"⚠️ debug_step9 포맷팅 중 오류: {type(e).__name__}: {e}"
@@ -3983,47 +4327,25 @@ class LabTableExtractor:
             if not rows:
                 return "ℹ️ step10_rows 비어있음 (Step 10 미실행 또는 이전 단계 결과 없음)"
 
-            def _s(v: Any) -> str:
-                try:
-                    if v is None:
-                        return ""
-                    return str(v)
-                except Exception:
-                    return ""
-
             labels = ["Name", "Min", "Max", "Result", "Unit"]
             data = []
             for r in rows:
                 data.append([
-                    _s(r.get("name")),
-                    _s(r.get("min")),
-                    _s(r.get("max")),
-                    _s(r.get("result")),
-                    _s(r.get("unit")),
+                    _debug_str(r.get("name")),
+                    _debug_str(r.get("min")),
+                    _debug_str(r.get("max")),
+                    _debug_str(r.get("result")),
+                    _debug_str(r.get("unit")),
                 ])
 
             # 열 폭 계산 및 정렬
-            widths = [len(l) for l in labels]
-            for row in data:
-                for i, v in enumerate(row):
-                    widths[i] = max(widths[i], len(v))
-
-            def fmt_row(cells: List[str]) -> str:
-                parts = []
-                for i, v in enumerate(cells):
-                    if labels[i] in ("Min", "Max", "Result"):
-                        parts.append(v.rjust(widths[i]))
-                    else:
-                        parts.append(v.ljust(widths[i]))
-                return " | ".join(parts)
+            widths = [max(map(len, col)) for col in zip(labels, *data, strict=True)]
+
+            fmt_row = _row_format(labels, widths, _DEBUG_RIGHT_ALIGN_LABELS)
 
             sep = "-+-".join(["-" * w for w in widths])
-            out: List[str] = []
-            out.append("🧪 Step 10: Reference → Min/Max 분리 결과(전체)")
-            out.append(fmt_row(labels))
-            out.append(sep)
-            for row in data:
-                out.append(fmt_row(row))
+            out: List[str] = ["🧪 Step 10: Reference → Min/Max 분리 결과(전체)", fmt_row(*labels), sep]
+            out.extend(fmt_row(*row) for row in data)
             return "\n".join(out)
         except Exception as e:
             return f"⚠️ debug_step10 포맷팅 중 오류: {type(e).__name__}: {e}"
@@ -4047,50 +4369,28 @@ class LabTableExtractor:
             if not rows:
                 return "ℹ️ step11_rows 비어있음 (Step 11 미실행 또는 이전 단계 결과 없음)"
 
-            def _s(v: Any) -> str:
-                try:
-                    if v is None:
-                        return ""
-                    return str(v)
-                except Exception:
-                    return ""
-
             labels = ["Name", "Result", "result_norm", "Unit", "unit_canonical", "Min", "min_norm", "Max", "max_norm"]
             data = []
             for r in rows:
                 data.append([
-                    _s(r.get("name")),
-                    _s(r.get("result")),
-                    _s(r.get("result_norm")),
-                    _s(r.get("unit")),
-                    _s(r.get("unit_canonical")),
-                    _s(r.get("min")),
-                    _s(r.get("min_norm")),
-                    _s(r.get("max")),
-                    _s(r.get("max_norm")),
+                    _debug_str(r.get("name")),
+                    _debug_str(r.get("result")),
+                    _debug_str(r.get("result_norm")),
+                    _debug_str(r.get("unit")),
+                    _debug_str(r.get("unit_canonical")),
+                    _debug_str(r.get("min")),
+                    _debug_str(r.get("min_norm")),
+                    _debug_str(r.get("max")),
+                    _debug_str(r.get("max_norm")),
                 ])
 
-            widths = [len(l) for l in labels]
-            for row in data:
-                for i, v in enumerate(row):
-                    widths[i] = max(widths[i], len(v))
+            widths = [max(map(len, col)) for col in zip(labels, *data, strict=True)]
 
-            def fmt_row(cells: List[str]) -> str:
-                parts = []
-                for i, v in enumerate(cells):
-                    if labels[i] in ("Result", "result_norm", "Min", "min_norm", "Max", "max_norm"):
-                        parts.append(v.rjust(widths[i]))
-                    else:
-                        parts.append(v.ljust(widths[i]))
-                return " | ".join(parts)
+            fmt_row = _row_format(labels, widths, _DEBUG_RIGHT_ALIGN_LABELS)
 
             sep = "-+-".join(["-" * w for w in widths])
-            out: List[str] = []
-            out.append("🧪 Step 11: Unit/Result 정규화 결과(전체)")
-            out.append(fmt_row(labels))
-            out.append(sep)
-            for row in data:
-                out.append(fmt_row(row))
+            out: List[str] = ["🧪 Step 11: Unit/Result 정규화 결과(전체)", fmt_row(*labels), sep]
+            out.extend(fmt_row(*row) for row in data)
             return "\n".join(out)
         except Exception as e:
             return f"⚠️ debug_step11 포맷팅 중 오류: {type(e).__name__}: {e}"
@@ -4126,10 +4426,7 @@ class LabTableExtractor:
             body_lines = intermediates.get("body_lines") or []
 
             # 표준화된 header_roles(list/any)를 roles mapping으로 변환하여 일관 사용
-            try:
-                roles_map = self._roles_to_mapping(header_roles)
-            except Exception:
-                roles_map = {}
+            roles_map = self._debug_roles_map(header_roles)
 
             # 임계값: step12에서 사용한 값이 있으면 그 값을 따름
             try:
@@ -4145,77 +4442,89 @@ class LabTableExtractor:
                 base_conf = 0.5
 
             # 행별 value 토큰의 OCR confidence 추출 (우선순위: _src_tokens['result'] → 라인/밴드 탐색)
-            import math
             def _conf_trunc4_str(x: Any) -> str:
+                # [0, 1]로 자른 뒤 소수 넷째 자리까지 버림 표기. 정수 연산으로 바로 포맷(NaN은 int()에서 실패 → "")
                 try:
                     f = float(x)
-                    if f < 0.0:
-                        f = 0.0
-                    elif f > 1.0:
-                        f = 1.0
-                    f4 = math.trunc(f * 10000) / 10000.0
-                    return f"{f4:.4f}"
+                    if f <= 0.0:
+                        return "0.0000"
+                    if f >= 1.0:
+                        return "1.0000"
+                    return f"0.{int(f * 10000):04d}"
                 except Exception:
                     return ""
-            num_re = re.compile(r"^\s*([+-]?\d+(?:[.,]\d+)?)")
             def _norm_num_str(s: Optional[str]) -> Optional[str]:
                 if not s or not isinstance(s, str):
                     return None
                 t = s.strip().replace("·", ".").replace(",", ".")
-                m = re.match(r"^[+-]?\d+(?:\.\d+)?", t)
+                m = _LEADING_NUM_RE.match(t)
                 return m.group(0) if m else None
 
-            def _value_token_conf_for_row(row_obj: Dict[str, Any]) -> Optional[float]:
+            # 라인별 숫자 토큰 인덱스(이 호출 동안만 유지). 같은 라인을 여러 행이 공유하므로
+            # 토큰 텍스트/좌표/신뢰도 파싱을 라인당 1회로 줄인다.
+            # line_idx → [(숫자 문자열, x 중심(좌표 없으면 None), confidence 0~1(없으면 None))]
+            num_tok_index: Dict[int, List[Tuple[str, Optional[float], Optional[float]]]] = {}
+
+            def _line_num_tokens(line_idx: int, line: Any) -> List[Tuple[str, Optional[float], Optional[float]]]:
+                entries = num_tok_index.get(line_idx)
+                if entries is not None:
+                    return entries
+                entries = []
+                for tok in line:
+                    try:
+                        if not isinstance(tok, dict):
+                            continue
+                        txt = str(tok.get("text", "") or "").strip()
+                        if not txt:
+                            continue
+                        m = _LEADING_NUM_GROUP_RE.match(txt.replace("·", ".").replace(",", "."))
+                        if not m:
+                            continue
+                        xl = tok.get("x_left"); xr = tok.get("x_right")
+                        xc = (float(xl) + float(xr)) / 2.0 if isinstance(xl, (int, float)) and isinstance(xr, (int, float)) else None
+                        conf = tok.get("confidence")
+                        cf = max(0.0, min(1.0, float(conf))) if isinstance(conf, (int, float)) else None
+                        entries.append((m.group(1), xc, cf))
+                    except Exception:
+                        continue
+                num_tok_index[line_idx] = entries
+                return entries
+
+            # 결과 열 인덱스(행과 무관하므로 1회 계산)
+            res_info = roles_map.get("result")
+            res_col: int = res_info["col_index"] if res_info else -1
+
+            def _src_token_conf(src_tokens: Any) -> Optional[float]:
+                """Step 8에서 고정 저장된 result 토큰의 confidence(0~1). 없으면 None."""
+                if isinstance(src_tokens, dict):
+                    tok = src_tokens.get("result")
+                    if isinstance(tok, dict):
+                        cf = tok.get("confidence")
+                        if isinstance(cf, (int, float)):
+                            try:
+                                return max(0.0, min(1.0, float(cf)))
+                            except Exception:
+                                pass
+                return None
+
+            def _value_token_conf(target: Optional[str], line_idx: Any, bands: Any) -> Optional[float]:
+                """행별 value 토큰 confidence(라인 토큰 탐색 경로). 행 dict 대신 미리 꺼낸 값(target/line_idx/bands)을 받는다.
+
+                Step 8 고정 토큰(_src_tokens)의 confidence가 있으면 호출 측에서 이 탐색을 건너뛴다.
+                """
                 try:
-                    # 0) Step 8에서 고정 저장된 토큰 우선 사용
-                    st = row_obj.get("_src_tokens") if isinstance(row_obj.get("_src_tokens"), dict) else None
-                    if isinstance(st, dict):
-                        tok = st.get("result")
-                        if isinstance(tok, dict):
-                            cf = tok.get("confidence")
-                            if isinstance(cf, (int, float)):
-                                try:
-                                    fv = float(cf)
-                                    return max(0.0, min(1.0, fv))
-                                except Exception:
-                                    pass
-                    # 기준 숫자 문자열: result_norm 우선, 없으면 result에서 숫자 부분
-                    target = row_obj.get("result_norm") if isinstance(row_obj.get("result_norm"), str) else None
-                    if not target:
-                        target = _norm_num_str(row_obj.get("result") if isinstance(row_obj.get("result"), str) else None)
+                    # 기준 숫자 문자열(result_norm 우선, 없으면 result의 숫자 부분)이 없으면 탐색 불가
                     if not target:
                         return None
                     # 특정 밴드(결과 열)에 속한 토큰만 대상으로 탐색
-                    line_idx = row_obj.get("_line_idx")
-                    bands = row_obj.get("_bands")
-                    res_info = roles_map.get("result") if isinstance(roles_map, dict) else None
-                    res_col = int(res_info.get("col_index", -1)) if isinstance(res_info, dict) else -1
                     if not (isinstance(line_idx, int) and isinstance(bands, list) and 0 <= res_col < len(bands)):
                         # 밴드 정보를 사용할 수 없으면 라인 전체에서 탐색(폴백)
                         line = body_lines[line_idx] if (isinstance(body_lines, list) and isinstance(line_idx, int) and 0 <= line_idx < len(body_lines)) else None
                         if not line:
                             return None
-                        for tok in (line or []):
-                            try:
-                                if not isinstance(tok, dict):
-                                    continue
-                                txt = str(tok.get("text", "") or "").strip()
-                                if not txt:
-                                    continue
-                                m = num_re.match(txt.replace("·", ".").replace(",", "."))
-                                if not m:
-                                    continue
-                                num_txt = m.group(1)
-                                if num_txt == target:
-                                    conf = tok.get("confidence")
-                                    if isinstance(conf, (int, float)):
-                                        try:
-                                            fv = float(conf)
-                                            return max(0.0, min(1.0, fv))
-                                        except Exception:
-                                            return None
-                            except Exception:
-                                continue
+                        for num_txt, _xc, cf in _line_num_tokens(line_idx, line):
+                            if num_txt == target and cf is not None:
+                                return cf
                         return None
 
                     # 밴드 한정 탐색
@@ -4225,37 +4534,19 @@ class LabTableExtractor:
                         return None
                     # line은 토큰들의 리스트로 가정
                     best_conf = None
-                    for tok in (line or []):
+                    for num_txt, xc, cf in _line_num_tokens(line_idx, line):
+                        if xc is None or cf is None:
+                            continue
                         try:
-                            if not isinstance(tok, dict):
-                                continue
-                            txt = str(tok.get("text", "") or "").strip()
-                            if not txt:
-                                continue
-                            xl = tok.get("x_left"); xr = tok.get("x_right")
-                            if not isinstance(xl, (int, float)) or not isinstance(xr, (int, float)):
-                                continue
-                            xc = (float(xl) + float(xr)) / 2.0
                             if not (L <= xc < R):
                                 continue
-                            m = num_re.match(txt.replace("·", ".").replace(",", "."))
-                            if not m:
-                                continue
-                            num_txt = m.group(1)
-                            conf = tok.get("confidence")
-                            if num_txt == target and isinstance(conf, (int, float)):
-                                try:
-                                    fv = float(conf)
-                                    return max(0.0, min(1.0, fv))
-                                except Exception:
-                                    return None
-                            # 후보 중 가장 높은 confidence를 보조 선택지로 저장
-                            if isinstance(conf, (int, float)):
-                                cf = max(0.0, min(1.0, float(conf)))
-                                if best_conf is None or cf > best_conf:
-                                    best_conf = cf
                         except Exception:
                             continue
+                        if num_txt == target:
+                            return cf
+                        # 후보 중 가장 높은 confidence를 보조 선택지로 저장
+                        if best_conf is None or cf > best_conf:
+                            best_conf = cf
                     return best_conf
                 except Exception:
                     return None
@@ -4271,68 +4562,38 @@ class LabTableExtractor:
                 # 폴백 시에도 신규 컬럼 순서를 유지
                 labels = ["code", "value", "value_conf", "unit", "reference_min", "reference_max", "reason"]
                 data: List[List[str]] = []
-                def _d(v: Any) -> str:
-                    try:
-                        if v is None:
-                            return "UNKNOWN"
-                        s = str(v)
-                        return s if s.strip() else "UNKNOWN"
-                    except Exception:
-                        return "UNKNOWN"
                 for t in excluded:
                     reason = t.get("_excluded_reason")
                     if isinstance(reason, list):
                         reason_s = ",".join(reason)
                     else:
-                        reason_s = _d(reason)
+                        reason_s = _debug_disp(reason)
                     conf = t.get("_value_conf")
                     # 표시: 소숫점 네 자리에서 자르기(반올림 없음)
                     conf_s = _conf_trunc4_str(conf) if isinstance(conf, (int, float)) else ""
                     data.append([
-                        _d(t.get("code")),
-                        _d(t.get("value")),
+                        _debug_disp(t.get("code")),
+                        _debug_disp(t.get("value")),
                         conf_s,
-                        _d(t.get("unit")),
-                        _d(t.get("reference_min")),
-                        _d(t.get("reference_max")),
+                        _debug_disp(t.get("unit")),
+                        _debug_disp(t.get("reference_min")),
+                        _debug_disp(t.get("reference_max")),
                         reason_s,
                     ])
-                widths = [len(l) for l in labels]
-                for row in data:
-                    for i, v in enumerate(row):
-                        widths[i] = max(widths[i], len(v))
-                def fmt_row(cells: List[str]) -> str:
-                    parts = []
-                    for i, v in enumerate(cells):
-                        if labels[i] in ("value", "reference_min", "reference_max", "value_conf"):
-                            parts.append(v.rjust(widths[i]))
-                        else:
-                            parts.append(v.ljust(widths[i]))
-                    return " | ".join(parts)
+                widths = [max(map(len, col)) for col in zip(labels, *data, strict=True)]
+                fmt_row = _row_format(labels, widths, _DEBUG_RIGHT_ALIGN_LABELS)
                 sep = "-+-".join(["-" * w for w in widths])
-                out.append(fmt_row(labels))
+                out.append(fmt_row(*labels))
                 out.append(sep)
-                for row in data:
-                    out.append(fmt_row(row))
+                out.extend(fmt_row(*row) for row in data)
                 return "\n".join(out)
 
-            # 도우미: 문자열 숫자 → float
-            def _to_float(v: Any) -> Optional[float]:
-                if v is None:
-                    return None
-                if isinstance(v, (int, float)):
-                    try:
-                        return float(v)
-                    except Exception:
-                        return None
-                if not isinstance(v, str):
-                    return None
-                try:
-                    return float(v.replace(",", "."))
-                except Exception:
-                    return None
-
             # 1) Step11 기준(라인 순)으로 행 구성 + value_conf/1·2차 필터 사유 산정
+            # 행별 value_conf는 column-level confidence 그대로이므로 루프 밖에서 1회 클램프
+            try:
+                row_base_conf = max(0.0, min(1.0, float(base_conf)))
+            except Exception:
+                row_base_conf = 0.0
             rows: List[Dict[str, Any]] = []
             for idx, r in enumerate(step11_rows):
                 try:
@@ -4341,18 +4602,24 @@ class LabTableExtractor:
                     unit_canon = r.get("unit_canonical") if isinstance(r.get("unit_canonical"), str) else None
                     unit = unit_canon or unit_raw
 
-                    val = _to_float(r.get("result_norm"))
-                    rmin = _to_float(r.get("min_norm"))
-                    rmax = _to_float(r.get("max_norm"))
+                    result_norm = r.get("result_norm")
+                    val = _debug_to_float(result_norm)
+                    rmin = _debug_to_float(r.get("min_norm"))
+                    rmax = _debug_to_float(r.get("max_norm"))
 
                     # value_conf: result 열의 column-level confidence
-                    try:
-                        conf = max(0.0, min(1.0, float(base_conf)))
-                    except Exception:
-                        conf = 0.0
+                    conf = row_base_conf
 
                     # 표시용 per-row value 토큰 confidence (가능하면 사용, 없으면 None)
-                    tok_conf = _value_token_conf_for_row(r)
+                    # Step 8에서 고정 저장된 토큰 confidence가 있으면 그대로 쓰고,
+                    # 없을 때만 기준 숫자 문자열을 만들어 라인 토큰을 탐색한다.
+                    tok_conf = _src_token_conf(r.get("_src_tokens"))
+                    if tok_conf is None:
+                        target = result_norm if isinstance(result_norm, str) else None
+                        if not target:
+                            result_raw = r.get("result")
+                            target = _norm_num_str(result_raw if isinstance(result_raw, str) else None)
+                        tok_conf = _value_token_conf(target, r.get("_line_idx"), r.get("_bands"))
 
                     reasons: List[str] = []
                     if val is None:
@@ -4385,38 +4652,21 @@ class LabTableExtractor:
 
             # 2) 중복 코드 규칙 적용: (code, unit) 기준으로 마지막만 포함
             #    - 단위가 비어있으면 code만으로 판정
-            last_index: Dict[tuple, int] = {}
-            def _dup_key(t: Dict[str, Any]) -> Optional[tuple]:
-                c = t.get("code")
-                if not (isinstance(c, str) and c.strip()):
-                    return None
-                u = t.get("unit")
-                if isinstance(u, str) and u.strip():
-                    return (c.strip(), u.strip())
-                return (c.strip(), None)
-
-            for idx, t in enumerate(rows):
-                k = _dup_key(t)
-                if k is not None:
-                    last_index[k] = idx
-            for idx, t in enumerate(rows):
-                k = _dup_key(t)
-                if k is not None:
-                    if not t["_reasons"] and last_index.get(k) != idx:
+            # 역순 1회 순회: 처음 본 키가 원래 순서상 마지막 → 이미 본 키는 중복
+            seen_keys: set = set()
+            for t in reversed(rows):
+                k = _step12_dedup_key(t)
+                if k is None:
+                    continue
+                if k in seen_keys:
+                    if not t["_reasons"]:
                         t["_reasons"].append("duplicated_code_kept_last")
+                else:
+                    seen_keys.add(k)
 
             # 3) 테이블 렌더링
             labels = ["code", "value", "value_conf", "unit", "reference_min", "reference_max", "drop_reason"]
 
-            def _disp(v: Any) -> str:
-                try:
-                    if v is None:
-                        return "UNKNOWN"
-                    s = str(v)
-                    return s if s.strip() else "UNKNOWN"
-                except Exception:
-                    return "UNKNOWN"
-
             data: List[List[str]] = []
             for t in rows:
                 reason_s = ",".join(t["_reasons"]) if t["_reasons"] else ""
@@ -4424,36 +4674,22 @@ class LabTableExtractor:
                 disp_conf = t.get("_tok_conf") if isinstance(t.get("_tok_conf"), (int, float)) else t.get("_conf")
                 conf_s = _conf_trunc4_str(disp_conf) if isinstance(disp_conf, (int, float)) else ""
                 data.append([
-                    _disp(t.get("code")),
-                    _disp(t.get("value")),
+                    _debug_disp(t.get("code")),
+                    _debug_disp(t.get("value")),
                     conf_s,
-                    _disp(t.get("unit")),
-                    _disp(t.get("reference_min")),
-                    _disp(t.get("reference_max")),
+                    _debug_disp(t.get("unit")),
+                    _debug_disp(t.get("reference_min")),
+                    _debug_disp(t.get("reference_max")),
                     reason_s,
                 ])
 
-            widths = [len(l) for l in labels]
-            for row in data:
-                for i, v in enumerate(row):
-                    widths[i] = max(widths[i], len(v))
+            widths = [max(map(len, col)) for col in zip(labels, *data, strict=True)]
 
-            def fmt_row(cells: List[str]) -> str:
-                parts = []
-                for i, v in enumerate(cells):
-                    if labels[i] in ("value", "reference_min", "reference_max", "value_conf"):
-                        parts.append(v.rjust(widths[i]))
-                    else:
-                        parts.append(v.ljust(widths[i]))
-                return " | ".join(parts)
+            fmt_row = _row_format(labels, widths, _DEBUG_RIGHT_ALIGN_LABELS)
 
             sep = "-+-".join(["-" * w for w in widths])
-            out: List[str] = []
-            out.append("🧾 Step 12: 포함/제외 tests 전체 (라인 순)")
-            out.append(fmt_row(labels))
-            out.append(sep)
-            for row in data:
-                out.append(fmt_row(row))
+            out: List[str] = ["🧾 Step 12: 포함/제외 tests 전체 (라인 순)", fmt_row(*labels), sep]
+            out.extend(fmt_row(*row) for row in data)
 
             return "\n".join(out)
         except Exception as e:
@@ -4483,23 +4719,12 @@ class LabTableExtractor:
             # 표준화된 header_roles(list/any)를 roles mapping으로 변환하여 사용
             header_roles = intermediates.get("header_roles")
             try:
-                roles_map = self._roles_to_mapping(header_roles)
+                roles_map = self._debug_roles_map(header_roles)
                 res_info = roles_map.get("result") if isinstance(roles_map, dict) else None
                 base_conf: float = float(res_info.get("confidence", 0.5)) if isinstance(res_info, dict) else 0.5
             except Exception:
                 base_conf = 0.5
 
-            def _disp(v: Any) -> str:
-                try:
-                    if v is None:
-                        return "UNKNOWN"
-                    s = str(v)
-                    if not s.strip():
-                        return "UNKNOWN"
-                    return s
-                except Exception:
-                    return "UNKNOWN"
-
             labels = ["code", "value", "unit", "reference_min", "reference_max"]
             data: List[List[str]] = []
             for t in tests:
@@ -4510,26 +4735,16 @@ class LabTableExtractor:
                 rmax = t.get("reference_max")
 
                 data.append([
-                    _disp(code),
-                    _disp(val),
-                    _disp(unit),
-                    _disp(rmin),
-                    _disp(rmax),
+                    _debug_disp(code),
+                    _debug_disp(val),
+                    _debug_disp(unit),
+                    _debug_disp(rmin),
+                    _debug_disp(rmax),
                 ])
 
-            widths = [len(l) for l in labels]
-            for row in data:
-                for i, v in enumerate(row):
-                    widths[i] = max(widths[i], len(v))
+            widths = [max(map(len, col)) for col in zip(labels, *data, strict=True)]
 
-            def fmt_row(cells: List[str]) -> str:
-                parts = []
-                for i, v in enumerate(cells):
-                    if labels[i] in ("value", "reference_min", "reference_max"):
-                        parts.append(v.rjust(widths[i]))
-                    else:
-                        parts.append(v.ljust(widths[i]))
-                return " | ".join(parts)
+            fmt_row = _row_format(labels, widths, _DEBUG_RIGHT_ALIGN_LABELS)
 
             sep = "-+-".join(["-" * w for w in widths])
             out: List[str] = []
@@ -4553,25 +4768,21 @@ class LabTableExtractor:
                 pass
 
             out.append("🧾 Step 13: 최종 JSON")
-            out.append(fmt_row(labels))
+            out.append(fmt_row(*labels))
             out.append(sep)
-            for row in data:
-                out.append(fmt_row(row))
+            out.extend(fmt_row(*row) for row in data)
 
             qa = intermediates.get("qa_summary") or {}
             if qa:
-                out.append("")
-                out.append("📊 QA 요약:")
-                for k, v in qa.items():
-                    out.append(f" - {k}: {v}")
+                out.extend(("", "📊 QA 요약:"))
+                out.extend(f" - {k}: {v}" for k, v in qa.items())
 
             # Pretty-print final JSON as part of the debug output
             try:
-                import json as _json
                 out.append("")
                 out.append("🧾 Final JSON:")
                 if isinstance(final_doc, dict):
-                    out.append(_json.dumps(final_doc, ensure_ascii=False, indent=2))
+                    out.append(json.dumps(final_doc, ensure_ascii=False, indent=2))
                 else:
                     out.append(str(final_doc))
             except Exception:
@@ -4618,10 +4829,13 @@ class LabTableExtractor:
             except Exception:
                 return 0.5
 
-        # 1) Remove UNKNOWN values
+        # 1) Remove UNKNOWN values + 2) Remove low confidence — 한 번의 순회로 판정
+        #    (excluded 기록 순서는 기존과 같게 UNKNOWN 전체 → low confidence 전체)
         removed_unknown = 0
-        filtered = []
+        removed_low_conf = 0
+        filtered2 = []
         excluded: List[Dict[str, Any]] = []
+        excluded_low: List[Dict[str, Any]] = []
         for t in tests:
             try:
                 if t.get("value") is None:
@@ -4633,12 +4847,6 @@ class LabTableExtractor:
                     continue
             except Exception:
                 pass
-            filtered.append(t)
-
-        # 2) Remove low confidence
-        removed_low_conf = 0
-        filtered2 = []
-        for t in filtered:
             try:
                 conf = compute_conf(t)
                 if conf < conf_threshold:
@@ -4646,49 +4854,37 @@ class LabTableExtractor:
                     rec = dict(t)
                     rec["_excluded_reason"] = ["low_confidence" ]
                     rec["_value_conf"] = round(float(conf), 3)
-                    excluded.append(rec)
+                    excluded_low.append(rec)
                     continue
             except Exception:
                 pass
             filtered2.append(t)
+        excluded.extend(excluded_low)
 
         # 3) De-duplicate by (code, unit) when unit is available; else by code (keep the last occurrence)
         #    - 퍼센트와 절대치(예: RETIC% vs RETIC#)가 공존하는 경우, 단위가 다르면 서로 다른 측정으로 간주해 보존합니다.
         #    - 단위가 명확하지 않은(비어있거나 None) 경우에는 기존대로 code만으로 중복 판정합니다.
         dedup_removed = 0
-        # 마지막 인덱스 기록: key = (code, unit_or_none)
-        last_index: Dict[tuple, int] = {}
-        def _dedup_key(t: Dict[str, Any]) -> Optional[tuple]:
-            c = t.get("code")
-            if not (isinstance(c, str) and c.strip()):
-                return None
-            u = t.get("unit")
-            u_key: Optional[str]
-            if isinstance(u, str) and u.strip():
-                u_key = u.strip()
-            else:
-                u_key = None
-            return (c.strip(), u_key)
-
-        for idx, t in enumerate(filtered2):
-            k = _dedup_key(t)
-            if k is not None:
-                last_index[k] = idx
 
+        # 역순 1회 순회: 처음 본 키(원래 순서상 마지막)만 유지. 결과/제외 목록은 끝에서 원래 순서로 되돌린다.
+        seen_keys: set = set()
         result: List[Dict[str, Any]] = []
-        for idx, t in enumerate(filtered2):
-            k = _dedup_key(t)
+        dup_excluded: List[Dict[str, Any]] = []
+        for t in reversed(filtered2):
+            k = _step12_dedup_key(t)
             if k is not None:
-                if last_index.get(k) != idx:
+                if k in seen_keys:
                     dedup_removed += 1
                     rec = dict(t)
                     rec["_excluded_reason"] = ["duplicated_code_kept_last"]
-                    excluded.append(rec)
+                    dup_excluded.append(rec)
                     continue
+                seen_keys.add(k)
             result.append(t)
+        result.reverse()
+        excluded.extend(reversed(dup_excluded))
 
-        new_doc = dict(final_doc)
-        new_doc["tests"] = result
+        new_doc = {**final_doc, "tests": result}
         stats = {
             "removed_unknown": removed_unknown,
             "removed_low_conf": removed_low_conf,
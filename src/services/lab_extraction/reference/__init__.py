@@ -5,7 +5,7 @@
 - code_lexicon: 검사항목 코드 사전 및 해석기
 - unit_lexicon: 단위 사전 및 해석기
 """
-from .reference_data import REFERENCE_TESTS
+from .reference_data import REFERENCE_BY_CODE, REFERENCE_TESTS
 from .code_lexicon import (
     build_code_lexicon,
     get_code_lexicon,
@@ -21,6 +21,7 @@ from .unit_lexicon import (
 __all__ = [
     # reference_data
     "REFERENCE_TESTS",
+    "REFERENCE_BY_CODE",
     # code_lexicon
     "build_code_lexicon",
     "get_code_lexicon",
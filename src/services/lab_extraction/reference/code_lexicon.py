@@ -18,24 +18,35 @@
 from __future__ import annotations
 
 import re
-from typing import Dict, Optional, Set, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 
 # 모듈 전역 캐시
 _LEXICON_CACHE: Optional[Dict[str, object]] = None
 
+# 키 생성/토큰 정규화용 정규식(모듈 로드 시 1회 컴파일)
+# - 공백 제거는 정규식 대신 "".join(s.split()) 사용(str.split()의 공백 판정은 \s와 동일)
+_NON_ALNUM_RE = re.compile(r"[^A-Z0-9]")
+# '(%)'/' (%)'/' %' → '%', '(#)'/' (#)'/' #' → '#' (괄호 앞 공백까지 한 번에 흡수)
+_PCT_VARIANT_RE = re.compile(r"\s*\(\s*%\s*\)|\s+%")
+_HASH_VARIANT_RE = re.compile(r"\s*\(\s*#\s*\)|\s+#")
+_HASH_END_RE = re.compile(r"#\s*$")
 
-def _generate_code_variants(code: str) -> Tuple[str, str]:
-    """코드에서 매칭에 사용할 2가지 키를 생성합니다.
-    - upper_key: 대문자 + 공백 제거 (원형 보존에 유리, 정확 매칭용)
-    - alnum_key: A-Z0-9 만 남긴 키 (특수문자 유실/OCR 변형 대비)
+# 모호 후보 필터링용 특수기호 힌트(문자별 비트)
+_HINT_BITS: Tuple[Tuple[str, int], ...] = tuple((ch, 1 << i) for i, ch in enumerate("+-%/_."))
 
-    예)
-      "WBC-NEU%" -> upper_key: "WBC-NEU%", alnum_key: "WBCNEU"
-      "Na/K"     -> upper_key: "NA/K",      alnum_key: "NAK"
-    """
-    upper = re.sub(r"\s+", "", code.upper())
-    alnum = re.sub(r"[^A-Z0-9]", "", upper)
-    return upper, alnum
+
+def _hint_mask(s: str) -> int:
+    """문자열에 포함된 특수기호 힌트(+,-,%,/,_,.)의 비트마스크."""
+    m = 0
+    for ch, bit in _HINT_BITS:
+        if ch in s:
+            m |= bit
+    return m
+
+
+def _uppercase_score(s: str) -> tuple:
+    """canonical 선택 점수: (완전 대문자 여부, 대문자 수, -길이, 문자열). 클수록 우선."""
+    return (s == s.upper(), sum(map(str.isupper, s)), -len(s), s)
 
 
 def build_code_lexicon() -> Dict[str, object]:
@@ -44,65 +55,46 @@ def build_code_lexicon() -> Dict[str, object]:
     반환 구조 dict:
     - canonical_set: Set[str]           모든 canonical 코드(원본 케이스 보존)
     - upper_index: Dict[str, str]       upper_key -> canonical (정확/즉시 매칭용)
-    - alnum_index: Dict[str, Set[str]]  alnum_key -> {canonical...} (강건 매칭용)
+    - alnum_index: Dict[str, Tuple[str, ...]]  alnum_key -> (canonical...) (강건 매칭용, 정렬된 튜플)
+    - alnum_unique: Dict[str, str]      후보가 하나뿐인 alnum_key -> canonical (resolve_code 빠른 경로)
+    - hint_mask: Dict[str, int]         canonical -> 특수기호 힌트 비트마스크 (모호 후보 필터링용)
     """
     # 지연 import (순환 의존성 최소화)
     from .reference_data import REFERENCE_TESTS
 
-    codes: Set[str] = set()
-    # REFERENCE_TESTS 항목들에서 code 수집
-    for item in REFERENCE_TESTS:
-        try:
-            code = item.get("code") if isinstance(item, dict) else None
-            if code:
-                codes.add(code)
-        except Exception:
-            continue
-
-    # 대소문자만 다른 코드들은 하나로 통합 (대문자 사용 비율이 높은 것을 남김)
-    by_upper: Dict[str, Set[str]] = {}
-    for c in codes:
-        key = re.sub(r"\s+", "", c.upper())
-        by_upper.setdefault(key, set()).add(c)
+    # REFERENCE_TESTS 항목들에서 code 수집 (dict 가 아니거나 code 가 비어 있으면 건너뜀)
+    codes: Set[str] = {code for item in REFERENCE_TESTS if isinstance(item, dict) and (code := item.get("code"))}
 
-    def _uppercase_score(s: str) -> tuple:
-        ups = sum(1 for ch in s if ch.isupper())
-        all_up = int(s == s.upper())
-        return (all_up, ups, -len(s), s)
+    # 대소문자/공백만 다른 코드들은 하나로 통합 (대문자 사용 비율이 높은 것을 남김)
+    # - 키 생성(upper_key: 대문자 + 공백 제거)과 대표 선택을 한 번의 순회로 처리
+    # - 그룹 키가 곧 upper_key 이므로 upper_index 는 그룹별 대표 매핑 그 자체(충돌 없음)
+    upper_index: Dict[str, str] = {}
+    for c in codes:
+        key = "".join(c.upper().split())
+        cur = upper_index.get(key)
+        if cur is None or _uppercase_score(c) > _uppercase_score(cur):
+            upper_index[key] = c
 
-    canonical_selected: Set[str] = set()
-    for key, variants in by_upper.items():
-        try:
-            chosen = sorted(list(variants), key=_uppercase_score, reverse=True)[0]
-        except Exception:
-            chosen = sorted(list(variants))[0]
-        canonical_selected.add(chosen)
+    canonical_set: Set[str] = set(upper_index.values())
 
-    canonical_set: Set[str] = set(sorted(canonical_selected))
+    # alnum_index: upper_key 에서 A-Z0-9 만 남긴 키 (특수문자 유실/OCR 변형 대비)
+    #   예) "WBC-NEU%" -> "WBCNEU", "NA/K" -> "NAK"
+    # 다:1 가능 (동일 alnum 을 공유하는 코드들 존재 가능)
+    # 값은 1~3개뿐이므로 누적 후 정렬된 튜플로 확정(조회 시 복사 불필요, 집합보다 작음)
+    alnum_acc: Dict[str, List[str]] = {}
+    for upper_key, code in upper_index.items():
+        alnum_acc.setdefault(_NON_ALNUM_RE.sub("", upper_key), []).append(code)
+    alnum_index: Dict[str, Tuple[str, ...]] = {k: tuple(sorted(v)) for k, v in alnum_acc.items()}
 
-    upper_index: Dict[str, str] = {}
-    alnum_index: Dict[str, Set[str]] = {}
-
-    for code in canonical_set:
-        upper_key, alnum_key = _generate_code_variants(code)
-        # upper_index 충돌 시 규칙: 완전 대문자 표기를 우선 채택
-        if upper_key in upper_index:
-            existing = upper_index[upper_key]
-            try:
-                if isinstance(existing, str) and existing != existing.upper() and code == code.upper():
-                    upper_index[upper_key] = code
-            except Exception:
-                # 문제가 있으면 기존 동작 유지(덮어쓰기)
-                upper_index[upper_key] = code
-        else:
-            upper_index[upper_key] = code
-        # alnum_index 는 다:1 가능 (동일 alnum 을 공유하는 코드들 존재 가능)
-        alnum_index.setdefault(alnum_key, set()).add(code)
+    # 대부분의 alnum_key 는 후보가 하나이므로 바로 반환할 수 있게 별도 인덱스로 둔다
+    alnum_unique: Dict[str, str] = {k: v[0] for k, v in alnum_index.items() if len(v) == 1}
 
     return {
         "canonical_set": canonical_set,
         "upper_index": upper_index,
         "alnum_index": alnum_index,
+        "alnum_unique": alnum_unique,
+        "hint_mask": {c: _hint_mask(c) for c in canonical_set},
     }
 
 
@@ -133,106 +125,112 @@ def resolve_code(token: str, lexicon: Optional[Dict[str, object]] = None) -> Opt
     """
     if not token:
         return None
+    # 빌드된 전역 사전은 함수 호출 없이 모듈 변수에서 바로 읽는다(최초 1회만 get_code_lexicon)
+    lx = lexicon or _LEXICON_CACHE or get_code_lexicon()
 
-    lx = lexicon or get_code_lexicon()
     upper_index: Dict[str, str] = lx["upper_index"]  # type: ignore[index]
-    alnum_index: Dict[str, Set[str]] = lx["alnum_index"]  # type: ignore[index]
+    alnum_index: Dict[str, Tuple[str, ...]] = lx["alnum_index"]  # type: ignore[index]
+    # 후보 1개짜리 alnum_key 인덱스(없는 사전이 주입되면 빈 dict → 기존 경로만 사용)
+    alnum_unique: Dict[str, str] = lx.get("alnum_unique") or {}  # type: ignore[assignment]
+    # canonical별 힌트 비트마스크(없는 사전이 주입되면 후보마다 계산)
+    hint_mask: Dict[str, int] = lx.get("hint_mask") or {}  # type: ignore[assignment]
 
     raw = token.strip()
     if not raw:
         return None
 
+    # 빠른 경로: 이미 정규화된 대문자 ASCII 토큰(예: 'WBC', 'NEU%')은 아래 정규화가
+    # 아무것도 바꾸지 않으므로(공백/'('/'#' 없음, upper() 불변) 바로 정확 매칭을 시도한다.
+    if raw.isascii() and raw.isupper() and raw.isprintable() and " " not in raw and "(" not in raw and "#" not in raw:
+        hit = upper_index.get(raw)
+        if hit is not None:
+            return hit
+
     # 특수 정규화: '(%)', ' (%)', ' %' 같은 변형을 '%'로 통일
     # 예) 'LYMPH(%)' / 'LYMPH (%)' / 'LYMPH %' -> 'LYMPH%'
+    # 기호가 없으면 정규식 스캔 자체를 건너뛴다
     def _normalize_percent_variants(s: str) -> str:
-        s2 = s
-        try:
-            s2 = re.sub(r"\(\s*%\s*\)", "%", s2)
-            s2 = re.sub(r"\s+%", "%", s2)
-        except re.error:
-            pass
-        return s2
+        return _PCT_VARIANT_RE.sub("%", s) if "%" in s else s
 
     # 추가: '(#)', ' #' 도 '#'로 통일
     def _normalize_hash_variants(s: str) -> str:
-        s2 = s
-        try:
-            s2 = re.sub(r"\(\s*#\s*\)", "#", s2)
-            s2 = re.sub(r"\s+#", "#", s2)
-        except re.error:
-            pass
-        return s2
+        return _HASH_VARIANT_RE.sub("#", s) if "#" in s else s
 
     raw_norm = _normalize_hash_variants(_normalize_percent_variants(raw))
 
     # '#'-base 우선 규칙: 토큰이 '#'(공백 포함)로 끝나고, 베이스가 사전에 존재하면 베이스를 우선 반환
     base_if_hash = None
-    try:
-        if re.search(r"#\s*$", raw_norm):
-            base_if_hash = re.sub(r"#\s*$", "", raw_norm)
-    except re.error:
-        base_if_hash = None
+    m_hash = _HASH_END_RE.search(raw_norm) if "#" in raw_norm else None
+    if m_hash:
+        base_if_hash = raw_norm[:m_hash.start()]
 
     if base_if_hash:
-        base_upper_key = re.sub(r"\s+", "", base_if_hash.upper())
-        if base_upper_key in upper_index:
-            return upper_index[base_upper_key]
+        base_upper_key = "".join(base_if_hash.upper().split())
+        hit = upper_index.get(base_upper_key)
+        if hit is not None:
+            return hit
 
-    upper_key = re.sub(r"\s+", "", raw_norm.upper())
+    upper_key = "".join(raw_norm.upper().split())
     # 1) 정확 매칭 (대/소문자, 공백 무시)
-    if upper_key in upper_index:
-        return upper_index[upper_key]
-
-    # 2) 알파넘 강건 매칭
-    alnum_key = re.sub(r"[^A-Z0-9]", "", upper_key)
-    candidates = set(alnum_index.get(alnum_key, set()))
+    hit = upper_index.get(upper_key)
+    if hit is not None:
+        return hit
+
+    # 2) 알파넘 강건 매칭 (후보 1개면 alnum_unique 에서 바로 반환)
+    alnum_key = _NON_ALNUM_RE.sub("", upper_key)
+    unique = alnum_unique.get(alnum_key)
+    if unique is not None:
+        return unique
+    candidates = alnum_index.get(alnum_key, ())
     # len==0 이어도 곧바로 반환하지 말고 0→O 폴백을 먼저 시도한다.
     if len(candidates) == 1:
         return next(iter(candidates))
 
     # 3) 특수기호 힌트 기반 필터링
-    hints = {
-        "+": "+",
-        "-": "-",
-        "%": "%",
-        "/": "/",
-        "_": "_",
-        ".": ".",
-    }
-    present = {h for h, sym in hints.items() if sym in raw_norm}
-    if present and candidates:
-        filtered = {c for c in candidates if any(h in c for h in present)}
-        if len(filtered) == 1:
-            return next(iter(filtered))
-        if len(filtered) > 1:
-            candidates = filtered
+    #    토큰에 있는 기호 중 하나라도 가진 후보만 남긴다(비트마스크 교집합)
+    #    토큰 마스크는 복수 후보가 있을 때만 계산한다(여기까지 오면 후보는 0개 또는 2개 이상).
+    present: Optional[int] = None
+
+    def _shares_hint(c: str) -> bool:
+        m = hint_mask.get(c)
+        return bool((m if m is not None else _hint_mask(c)) & present)  # type: ignore[operator]
+
+    if candidates:
+        present = _hint_mask(raw_norm)
+        if present:
+            filtered = {c for c in candidates if _shares_hint(c)}
+            if len(filtered) == 1:
+                return next(iter(filtered))
 
     # 4) '0'→'O' 폴백: OCR 이 'O'를 '0'으로 읽은 케이스 보정 (예: p02 → pO2, C02 → CO2)
     try:
         upper_key_o = upper_key.replace("0", "O")
-        if upper_key_o != upper_key and upper_key_o in upper_index:
-            return upper_index[upper_key_o]
+        if upper_key_o != upper_key:
+            hit = upper_index.get(upper_key_o)
+            if hit is not None:
+                return hit
 
         alnum_key_o = alnum_key.replace("0", "O")
         if alnum_key_o != alnum_key:
-            candidates_o = set(alnum_index.get(alnum_key_o, set()))
+            unique_o = alnum_unique.get(alnum_key_o)
+            if unique_o is not None:
+                return unique_o
+            candidates_o = alnum_index.get(alnum_key_o, ())
             if len(candidates_o) == 1:
                 return next(iter(candidates_o))
 
             if candidates_o:
                 # 기존 특수기호 힌트로 1회 더 필터링
-                filtered_o = {c for c in candidates_o if any(h in c for h in present)} if 'present' in locals() else candidates_o
+                if present is None:
+                    present = _hint_mask(raw_norm)
+                filtered_o = {c for c in candidates_o if _shares_hint(c)}
                 if len(filtered_o) == 1:
                     return next(iter(filtered_o))
     except Exception:
         # 폴백 과정에서의 예외는 무시하고 상위 로직에 판단을 맡깁니다.
         pass
 
-    # 폴백까지 실패했고 candidates도 없거나 모호하면 None
-    if not candidates:
-        return None
-
-    # 5) 여전히 복수면 보수적으로 None 반환 (상위 로직에서 컨텍스트로 결정)
+    # 5) 폴백까지 실패: 후보가 없거나 여전히 복수면 보수적으로 None 반환 (상위 로직에서 컨텍스트로 결정)
     return None
 
 
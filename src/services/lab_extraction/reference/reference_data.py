@@ -5,7 +5,9 @@
 # - 가능한 모든 항목에 name / unit / meaning / description 포함
 # - (Ven)/(Art)/(Cap)가 코드에 포함되면 sample_type 필드를 보존
 
-REFERENCE_TESTS = [
+from typing import Any
+
+REFERENCE_TESTS: list[dict[str, Any]] = [
 
     # --------------------------------------------------------
     # BLOOD GAS / 혈액가스 분석
@@ -68,8 +70,7 @@ REFERENCE_TESTS = [
     {"code": "HGB", "name": "Hemoglobin", "unit": "g/dL", "meaning": "헤모글로빈 농도", "description": "산소 운반 단백질. 빈혈 진단 기준."},
     {"code": "LUC", "name": "Large Unstained Cells", "unit": "%", "meaning": "염색되지 않은 대형세포 비율", "description": "대식세포 또는 비정형 림프구 포함. 감염, 종양성 질환 등에서 증가 가능."},
     {"code": "LYM", "name": "Lymphocytes (Absolute)", "unit": "K/µL", "meaning": "림프구 절대수", "description": "면역반응·바이러스 감염 시 증가. 스트레스 반응 시 감소."},
-    {"code": "LYMPH", "name": "Lymphocytes (Absolute)", "unit": "K/µL", "meaning": "림프구 절대수", "description": "면역반응·바이러스 감염 시 증가. 스트레스 반응 시 감소."},
-    {"code": "LYMPH", "name": "Lymphocytes (Absolute)", "unit": "K/µL", "meaning": "림프구 절대수", "description": "단위 부피당 림프구 수. 스트레스, 면역 반응 상태 평가에 활용."},
+    {"code": "LYMPH", "name": "Lymphocytes (Absolute)", "unit": "K/µL", "meaning": "림프구 절대수", "description": "면역반응·바이러스 감염 시 증가. 스트레스 반응 시 감소. 단위 부피당 림프구 수. 스트레스, 면역 반응 상태 평가에 활용."},
     {"code": "LYMPHO", "name": "Lymphocytes (Absolute)", "unit": "K/µL", "meaning": "림프구 절대수", "description": "단위 부피당 림프구 수. 스트레스, 면역 반응 상태 평가에 활용."},
     {"code": "MCH", "name": "Mean Corpuscular Hemoglobin", "unit": "pg", "meaning": "평균 적혈구 혈색소량", "description": "적혈구 1개당 헤모글로빈 함량. 철결핍성 빈혈에서 감소."},
     {"code": "MCHC", "name": "Mean Corpuscular Hemoglobin Concentration", "unit": "g/dL", "meaning": "평균 혈색소 농도", "description": "적혈구 내 Hb 농도. 저색소성 빈혈, 탈수 감별에 도움."},
@@ -161,7 +162,7 @@ REFERENCE_TESTS = [
     {"code": "T.Billirubin", "name": "Total Bilirubin", "unit": "mg/dL", "meaning": "총 빌리루빈 (Total Bilirubin)", "description": "헤모글로빈 대사 산물. 간세포 손상, 담도 폐쇄 시 증가."},
     {"code": "T.Protein", "name": "Total Protein", "unit": "g/dL", "meaning": "총 단백질 (Total Protein)", "description": "혈장 내 단백질 농도. 알부민과 글로불린의 합. 탈수 시 증가, 간질환·단백질 손실 시 감소."},
     {"code": "T.cholesterol", "name": "Total Cholesterol", "unit": "mg/dL", "meaning": "총 콜레스테롤 농도", "description": "지질대사 지표. 갑상선 기능저하증, 신증후군 등에서 상승."},
-    {"code": "T4", "name": "Total Thyroxine", "unit": "µg/dL", "meaning": "총 갑상선호르몬(T4)", "description": "갑상선 기능 평가 지표. 고양이 항진증, 개 저하증 진단에 핵심."},
+    {"code": "T4", "name": "Total Thyroxine", "unit": "µg/dL", "meaning": "총 갑상선호르몬(T4)", "description": "갑상선 기능 평가 지표. 고양이 항진증, 개 저하증 진단에 핵심. 갑상선 기능 저하증 또는 항진증 진단에 사용되는 주요 지표."},
     {"code": "TBIL", "name": "Total Bilirubin", "unit": "mg/dL", "meaning": "총 빌리루빈 (담즙 색소)", "description": "적혈구 파괴 및 간 배설 반영. 간질환, 용혈, 담즙정체 시 상승."},
     {"code": "TCHO", "name": "Total Cholesterol", "unit": "mg/dL", "meaning": "총 콜레스테롤", "description": "지질대사 반영. 갑상선 저하, 쿠싱증후군, 담즙정체 시 상승."},
     {"code": "TG", "name": "Triglyceride", "unit": "mg/dL", "meaning": "중성지방", "description": "지질대사 지표. 식후 상승, 당뇨·쿠싱증후군에서 증가 가능."},
@@ -219,7 +220,12 @@ REFERENCE_TESTS = [
     # OTHER / 기타
     # --------------------------------------------------------
     {"code": "BP", "name": "Blood Pressure", "unit": "mmHg", "meaning": "혈압", "description": "수축기/이완기/평균혈압(MAP) 포함 가능."},
-    {"code": "T4", "name": "Total Thyroxine", "unit": "µg/dL", "meaning": "총 갑상선호르몬 (T4)", "description": "갑상선 기능 저하증 또는 항진증 진단에 사용되는 주요 지표."},
 ]
 
-__all__ = ['REFERENCE_TESTS']
\ No newline at end of file
+# code → 항목 색인 (import 시 1회 구성, 코드별 조회를 선형 탐색 대신 해시 조회로)
+# - REFERENCE_TESTS의 code는 고유함(파일 상단 규칙, tests/test_reference_data.py에서 검증)
+# - 대소문자 무시 색인은 두지 않음: LAC/Lac, GLU/Glu 처럼 대소문자만 다른 코드가 서로 다른 항목이므로
+#   대소문자 무시 해석은 code_lexicon.resolve_code 를 사용
+REFERENCE_BY_CODE: dict[str, dict] = {item["code"]: item for item in REFERENCE_TESTS}
+
+__all__ = ['REFERENCE_TESTS', 'REFERENCE_BY_CODE']
\ No newline at end of file
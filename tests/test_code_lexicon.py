@@ -44,13 +44,14 @@ class TestBuildCodeLexicon:
         """upper_index가 Dict[str, str]"""
         lexicon = build_code_lexicon()
         assert isinstance(lexicon["upper_index"], dict)
-    def test_alnum_index_is_dict_of_sets(self):
-        """alnum_index가 Dict[str, Set[str]]"""
+    def test_alnum_index_is_dict_of_tuples(self):
+        """alnum_index가 Dict[str, Tuple[str, ...]]"""
         lexicon = build_code_lexicon()
         assert isinstance(lexicon["alnum_index"], dict)
         # 아무 값이나 확인
         for key, value in list(lexicon["alnum_index"].items())[:1]:
-            assert isinstance(value, set)
+            assert isinstance(value, tuple)
+            assert len(value) >= 1
 class TestGetCodeLexicon:
     """get_code_lexicon() 테스트"""
     def test_returns_cached_lexicon(self):
@@ -155,3 +156,10 @@ class TestResolveCodeEdgeCases:
         # 일반적인 코드는 ASCII만 사용
         result = resolve_code("WBC")
         assert result == "WBC"
+class TestResolveCodeLexiconArg:
+    """resolve_code() 사전 인자 테스트"""
+    def test_global_matches_explicit_lexicon(self):
+        """전역 사전(lexicon 생략)과 별도 사전 전달 결과 일치"""
+        fresh = build_code_lexicon()
+        for token in ["WBC", "wbc", "p02", "Na+", "LYMPH (%)", "XXXYYY"]:
+            assert resolve_code(token) == resolve_code(token, fresh)
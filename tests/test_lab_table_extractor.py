@@ -244,6 +244,111 @@ class TestExtractFromLines:
 
         assert isinstance(result, dict)
 
+    def test_fused_path_matches_staged_path(self):
+        """Step 9~11 행 단위 1패스 결과가 단계별 경로(return_intermediates=True)와 동일"""
+        def tok(text, x_left, li):
+            return {"text": text, "x_left": x_left, "x_right": x_left + 8 * len(text),
+                    "y_center": 50 + li * 30, "line_index": li, "confidence": 0.99}
+
+        cols = [10, 120, 230, 340]
+        rows = [
+            ["검사항목", "결과", "단위", "참고치"],
+            ["WBC", "12.3H", "K/µL", "5.5-19.5"],   # 플래그 붙은 결과 + a-b 참고치
+            ["RBC", "7.2", "M/µL", None],           # 참고치 누락 → UNKNOWN
+            ["HGB", "12.0", "g/dL", "9.8-15.4"],    # 꼬리 셀 추가 → truncate_tail
+            ["ALT", "45", "U/L", "12-130"],
+        ]
+        lines = [
+            [tok(t, cols[j], li) for j, t in enumerate(row) if t is not None]
+            for li, row in enumerate(rows)
+        ]
+
+        def make_extractor():
+            extractor = LabTableExtractor(settings=Settings(debug=False))
+            fill = extractor._fill_unknowns
+
+            # 헤더 열 수보다 긴 행을 만들어 Step 9 꼬리 자르기를 태운다
+            def fill_with_tail(*args, **kwargs):
+                filled = fill(*args, **kwargs)
+                for r in filled:
+                    if r.get("name") == "HGB":
+                        r["_cells"] = r["_cells"] + ["*"]
+                return filled
+
+            extractor._fill_unknowns = fill_with_tail
+            return extractor
+
+        fused = make_extractor().extract_from_lines(lines)
+        staged, intermediates = make_extractor().extract_from_lines(lines, return_intermediates=True)
+
+        assert fused == staged
+        # 행 단위로도 동일(_cells 꼬리 자르기처럼 최종 JSON에 드러나지 않는 차이까지 비교)
+        finalized = make_extractor()._finalize_rows(
+            intermediates["filled_rows"], intermediates["header_roles"]
+        )
+        assert finalized == intermediates["step11_rows"]
+        # 입력이 의도한 분기를 모두 거쳤는지 확인
+        assert [r.get("_row_fix") for r in intermediates["step9_rows"]].count("truncate_tail") == 1
+        by_name = {r["name"]: r for r in intermediates["step11_rows"]}
+        assert by_name["WBC"]["min"] == "5.5" and by_name["WBC"]["max"] == "19.5"
+        assert by_name["WBC"]["result_norm"] == "12.3"
+        assert by_name["RBC"]["reference"] == "UNKNOWN"
+        assert {t["code"] for t in fused["tests"]} == {"WBC", "RBC", "HGB", "ALT"}
+
+
+# =============================================================================
+# 밴드 배정 테스트
+# =============================================================================
+
+class TestBandAssignment:
+    """Step 8 밴드 배정: 열이 많은 표의 평면 누적 경로"""
+
+    K = 10
+
+    def _lines(self):
+        cols = [20 + 100 * j for j in range(self.K)]
+
+        def tok(text, x_left, li, width=30):
+            return {"text": text, "x_left": x_left, "x_right": x_left + width,
+                    "y_center": 50 + li * 30, "line_index": li}
+
+        # 샘플 라인(토큰 수 == K)으로 밴드 중심을 정한다
+        lines = [[tok(f"c{li}{j}", cols[j] + (li % 3) * 4, li) for j in range(self.K)] for li in range(3)]
+        # 같은 열에 여러 토큰, 밴드 사이, 양끝 바깥, 빈 열이 섞인 라인
+        lines.append([
+            tok("L0", -400, 3),
+            tok("a", cols[0], 3, 10), tok("b", cols[0] + 15, 3, 10),
+            tok("mid", cols[2] + 60, 3, 20),
+            tok("x", cols[5], 3), tok("y", cols[5] + 5, 3), tok("z", cols[5] + 2, 3),
+            tok("R9", cols[-1] + 600, 3),
+        ])
+        lines.append([tok("only", cols[7], 4)])
+        return lines
+
+    @pytest.mark.parametrize("mode", ["nearest", "hybrid", "include"])
+    def test_flat_path_matches_list_path(self, mode):
+        """9열 이상에서 평면 누적 경로와 열별 리스트 경로의 셀 결과가 동일"""
+        lines = self._lines()
+        results = []
+        for flat_min in (8, None):
+            extractor = LabTableExtractor(
+                settings=Settings(band_assignment_mode=mode, band_flat_cells_min_cols=flat_min)
+            )
+            rows, dbg = extractor._build_interim_table(lines, None, col_count=self.K)
+            assert dbg["sample_count"] == 3
+            results.append([r["_cells"] for r in rows])
+
+        flat, per_col = results
+        assert flat == per_col
+        assert all(len(cells) == self.K for cells in flat)
+        # 같은 열의 토큰은 중심 x 순서로 결합
+        assert flat[3][5] == "x z y"
+        if mode == "include":
+            # 밴드 바깥 토큰은 미배정
+            assert "L0" not in flat[3] and "R9" not in flat[3]
+        else:
+            assert flat[3][0].startswith("L0") and flat[3][-1].endswith("R9")
+
 
 # =============================================================================
 # OCR → LinePreprocessor → LabTableExtractor 통합 테스트
@@ -292,6 +397,17 @@ class TestCodeNormalization:
             # _resolve_code 메서드 존재 확인
             assert hasattr(extractor, '_resolve_code')
 
+    def test_resolver_results_not_cached(self):
+        """외부 리졸버가 있으면 코드 해석 결과를 캐시하지 않음"""
+        answers = iter([None, "WBC"])
+
+        def flaky_resolver(text, lexicon):
+            return next(answers)
+
+        extractor = LabTableExtractor(resolver=flaky_resolver)
+        assert extractor._resolve_code("QQZZXX") is None
+        assert extractor._resolve_code("QQZZXX") == "WBC"
+
     def test_canonicalize_setting(self):
         """코드 정규화 설정"""
         settings = Settings(canonicalize_codes=True)
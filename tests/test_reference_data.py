@@ -88,3 +88,29 @@ class TestReferenceDataSpecialCases:
         unique_ratio = len(set(codes)) / len(codes)
         assert unique_ratio > 0.9, \
             f"중복 코드가 너무 많음: 고유 비율 {unique_ratio:.2%}"
+class TestReferenceByCode:
+    """REFERENCE_BY_CODE 색인 테스트"""
+    def test_covers_all_codes(self):
+        """모든 code가 색인에 존재"""
+        from src.services.lab_extraction.reference import REFERENCE_BY_CODE, REFERENCE_TESTS
+        assert set(REFERENCE_BY_CODE) == {item["code"] for item in REFERENCE_TESTS}
+    def test_codes_are_unique(self):
+        """REFERENCE_TESTS의 code는 중복 없이 고유"""
+        from src.services.lab_extraction.reference.reference_data import (
+            REFERENCE_BY_CODE,
+            REFERENCE_TESTS,
+        )
+        codes = [item["code"] for item in REFERENCE_TESTS]
+        assert len(codes) == len(set(codes))
+        assert len(REFERENCE_BY_CODE) == len(REFERENCE_TESTS)
+        for item in REFERENCE_TESTS:
+            assert REFERENCE_BY_CODE[item["code"]] is item
+        assert REFERENCE_BY_CODE.get("NOT_A_CODE") is None
+    def test_lookup_is_case_sensitive(self):
+        """대소문자만 다른 코드(LAC/Lac, GLU/Glu)는 서로 다른 항목"""
+        from src.services.lab_extraction.reference.reference_data import REFERENCE_BY_CODE
+        for upper, mixed in (("LAC", "Lac"), ("GLU", "Glu")):
+            assert upper in REFERENCE_BY_CODE and mixed in REFERENCE_BY_CODE
+            assert REFERENCE_BY_CODE[upper] is not REFERENCE_BY_CODE[mixed]
+            assert REFERENCE_BY_CODE[upper]["code"] == upper
+            assert REFERENCE_BY_CODE[mixed]["code"] == mixed